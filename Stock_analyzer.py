@@ -5,11 +5,13 @@
 
 import sys
 import os
+import importlib
+import threading
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.data_fetcher import StockDataFetcher, get_popular_stocks
-from src.technical_analyzer import analyze_stock_technical
-from src.visualizer import create_analysis_report_chart, StockVisualizer
+from src.technical_analyzer import TechnicalAnalyzer, analyze_stock_technical
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import warnings
@@ -19,12 +21,26 @@ warnings.filterwarnings('ignore')
 class StockAnalysisSystem:
     """股票分析系统"""
     
+    # 批量结果超过该数量时只对前K名完整排序
+    BATCH_TOP_K_THRESHOLD = 50
+    BATCH_TOP_K = 10
+    
     def __init__(self):
         """初始化系统"""
         self.data_fetcher = StockDataFetcher()
-        self.visualizer = StockVisualizer()
+        self._visualizer = None
         self.popular_stocks = get_popular_stocks()
-        
+        # 后台预编译指标内核，用户输入期间完成JIT
+        TechnicalAnalyzer.start_warmup()
+        
+    @property
+    def visualizer(self):
+        """图表生成器 (首次使用时才导入matplotlib等可视化依赖)"""
+        if self._visualizer is None:
+            from src.visualizer import StockVisualizer
+            self._visualizer = StockVisualizer()
+        return self._visualizer
+    
     def show_welcome(self):
         """显示欢迎信息"""
         print("=" * 60)
@@ -86,7 +102,7 @@ class StockAnalysisSystem:
         
         print(f"\n🔄 正在分析 {symbol} (周期: {period})...")
         
-        # 获取数据
+        # 获取数据 (获取器优先读取本地缓存)
         data = self.data_fetcher.get_stock_data(symbol, period)
         if data is None:
             print(f"❌ 无法获取 {symbol} 的数据")
@@ -98,14 +114,38 @@ class StockAnalysisSystem:
         # 进行技术分析
         analysis_result = analyze_stock_technical(data, symbol)
         
+        # 用户阅读结果期间在后台预先导入可视化模块，回答后无需再等待matplotlib加载
+        prefetch = self._prefetch_visualizer()
+        
         # 显示分析结果
         self.display_analysis_result(analysis_result, stock_info)
         
         # 询问是否生成图表
         show_chart = input("\n是否生成技术分析图表? (y/n, 默认y): ").strip().lower()
         if show_chart != 'n':
+            prefetch.join()
+            from src.visualizer import create_analysis_report_chart
             create_analysis_report_chart(analysis_result)
     
+    @staticmethod
+    def _prefetch_visualizer() -> threading.Thread:
+        """
+        在后台线程中导入可视化模块 (图表本身仍在主线程绘制，matplotlib的GUI后端要求如此)
+        
+        Returns:
+            threading.Thread: 导入线程
+        """
+        def load():
+            try:
+                importlib.import_module('src.visualizer')
+            except Exception:
+                # 导入失败留给主线程真正使用时报告
+                pass
+        
+        thread = threading.Thread(target=load, name='visualizer-prefetch', daemon=True)
+        thread.start()
+        return thread
+    
     def analyze_multiple_stocks(self):
         """批量分析多只股票"""
         print("\n📊 批量股票分析")
@@ -117,21 +157,23 @@ class StockAnalysisSystem:
             print("❌ 请输入至少一个股票代码")
             return
         
-        symbols = [s.strip().upper() for s in symbols_input.split(',')]
+        symbols = self.filter_valid_symbols([s.strip().upper() for s in symbols_input.split(',')])
+        if not symbols:
+            print("❌ 没有有效的股票代码")
+            return
         period = '3mo'  # 默认3个月
         
         print(f"\n🔄 正在批量分析 {len(symbols)} 只股票...")
         
-        results = []
-        for symbol in symbols:
-            print(f"\n📈 分析 {symbol}...")
-            data = self.data_fetcher.get_stock_data(symbol, period)
+        stocks_data = {}
+        for symbol, data in self.fetch_multiple(symbols, period).items():
             if data is not None:
-                result = analyze_stock_technical(data, symbol)
-                results.append(result)
+                stocks_data[symbol] = data
             else:
                 print(f"❌ 跳过 {symbol} (数据获取失败)")
         
+        results = self.analyze_multiple(stocks_data)
+        
         if not results:
             print("❌ 没有成功分析的股票")
             return
@@ -149,7 +191,7 @@ class StockAnalysisSystem:
             print("❌ 请输入股票代码")
             return
         
-        symbols = [s.strip().upper() for s in symbols_input.split(',')]
+        symbols = self.filter_valid_symbols([s.strip().upper() for s in symbols_input.split(',')])
         if len(symbols) < 2:
             print("❌ 至少需要2只股票进行对比")
             return
@@ -159,8 +201,7 @@ class StockAnalysisSystem:
         print(f"\n🔄 正在获取对比数据...")
         stocks_data = {}
         
-        for symbol in symbols:
-            data = self.data_fetcher.get_stock_data(symbol, period)
+        for symbol, data in self.fetch_multiple(symbols, period).items():
             if data is not None:
                 stocks_data[symbol] = data
                 print(f"✅ {symbol} 数据获取成功")
@@ -177,74 +218,117 @@ class StockAnalysisSystem:
         # 显示对比摘要
         self.display_comparison_summary(stocks_data)
     
+    def filter_valid_symbols(self, symbols: list) -> list:
+        """
+        批量验证股票代码，剔除无效代码以免进入耗时的数据获取流程
+        
+        Args:
+            symbols: 股票代码列表
+            
+        Returns:
+            list: 有效的股票代码
+        """
+        print(f"🔍 正在验证 {len(symbols)} 个股票代码...")
+        valid_symbols = self.data_fetcher.validate_symbols(symbols)
+        for symbol in symbols:
+            if symbol not in valid_symbols:
+                print(f"⚠️ 跳过无效股票代码: {symbol}")
+        return valid_symbols
+    
+    def fetch_multiple(self, symbols: list, period: str) -> dict:
+        """
+        批量获取多只股票数据 (缓存未命中的股票合并为批量下载请求)
+        
+        Args:
+            symbols: 股票代码列表
+            period: 时间周期
+            
+        Returns:
+            dict: 按输入顺序排列的 {股票代码: DataFrame或None}
+        """
+        results = self.data_fetcher.get_multiple_stocks(symbols, period)
+        return {symbol: results.get(symbol) for symbol in symbols}
+    
+    def analyze_multiple(self, stocks_data: dict) -> list:
+        """
+        分析多只股票 (串行：批量通常每只几十到几百根K线，单只分析约1毫秒，
+        进程池的启动与数据传递开销远大于计算本身)
+        
+        Args:
+            stocks_data: {股票代码: DataFrame}
+            
+        Returns:
+            list: 分析结果列表，顺序与输入一致
+        """
+        return [analyze_stock_technical(data, symbol, include_data=False)
+                for symbol, data in stocks_data.items()]
+    
     def display_analysis_result(self, result: dict, stock_info: dict):
-        """显示分析结果"""
-        print(f"\n" + "=" * 60)
-        print(f"📊 {result['symbol']} 技术分析报告")
-        print(f"📅 分析日期: {result['analysis_date']}")
-        print("=" * 60)
+        """显示分析结果 (整份报告拼接后一次写出)"""
+        lines = []
+        lines.append(f"\n" + "=" * 60)
+        lines.append(f"📊 {result['symbol']} 技术分析报告")
+        lines.append(f"📅 分析日期: {result['analysis_date']}")
+        lines.append("=" * 60)
         
         # 基本信息
         if 'name' in stock_info:
-            print(f"🏢 公司名称: {stock_info['name']}")
+            lines.append(f"🏢 公司名称: {stock_info['name']}")
         if 'sector' in stock_info:
-            print(f"🏭 所属行业: {stock_info['sector']}")
+            lines.append(f"🏭 所属行业: {stock_info['sector']}")
         
         # 价格信息
-        print(f"\n💰 价格信息:")
-        print(f"  当前价格: ${result['current_price']}")
+        lines.append(f"\n💰 价格信息:")
+        lines.append(f"  当前价格: ${result['current_price']}")
         
         change_emoji = "📈" if result['price_change'] > 0 else "📉" if result['price_change'] < 0 else "➡️"
-        print(f"  日变化: {change_emoji} ${result['price_change']:+.2f} ({result['price_change_pct']:+.2f}%)")
-        print(f"  成交量: {result['volume']:,}")
+        lines.append(f"  日变化: {change_emoji} ${result['price_change']:+.2f} ({result['price_change_pct']:+.2f}%)")
+        lines.append(f"  成交量: {result['volume']:,}")
         
         # 技术指标摘要
-        print(f"\n📊 关键技术指标:")
+        lines.append(f"\n📊 关键技术指标:")
         indicators = result['indicators']
         
         if 'RSI_14' in indicators:
             rsi = indicators['RSI_14']
             rsi_status = "超买" if rsi > 70 else "超卖" if rsi < 30 else "正常"
-            print(f"  RSI(14): {rsi:.1f} ({rsi_status})")
+            lines.append(f"  RSI(14): {rsi:.1f} ({rsi_status})")
         
         if 'MACD' in indicators:
-            print(f"  MACD: {indicators['MACD']:.3f}")
+            lines.append(f"  MACD: {indicators['MACD']:.3f}")
         
         if 'BB_percent' in indicators:
             bb = indicators['BB_percent']
             bb_status = "高位" if bb > 0.8 else "低位" if bb < 0.2 else "中位"
-            print(f"  布林带位置: {bb:.2f} ({bb_status})")
+            lines.append(f"  布林带位置: {bb:.2f} ({bb_status})")
         
         if 'MFI' in indicators:
             mfi = indicators['MFI']
             mfi_status = "超买" if mfi > 80 else "超卖" if mfi < 20 else "正常"
-            print(f"  资金流量指数: {mfi:.1f} ({mfi_status})")
+            lines.append(f"  资金流量指数: {mfi:.1f} ({mfi_status})")
         
         # 移动平均线状态
-        print(f"\n📈 移动平均线状态:")
+        lines.append(f"\n📈 移动平均线状态:")
         for period in [5, 20, 50]:
             key = f'Price_vs_SMA_{period}'
             if key in indicators:
                 pct = indicators[key]
                 status = "✅" if pct > 0 else "❌"
-                print(f"  SMA{period}: {status} {pct:+.2f}%")
+                lines.append(f"  SMA{period}: {status} {pct:+.2f}%")
         
         # 交易信号
         signals = result['signals']
         score = signals['score']
         
-        print(f"\n🎯 交易信号分析:")
-        print(f"🟢 买入信号 ({len(signals['buy'])}):")
-        for signal in signals['buy']:
-            print(f"  • {signal}")
+        lines.append(f"\n🎯 交易信号分析:")
+        lines.append(f"🟢 买入信号 ({len(signals['buy'])}):")
+        lines.extend(f"  • {signal}" for signal in signals['buy'])
         
-        print(f"\n🔴 卖出信号 ({len(signals['sell'])}):")
-        for signal in signals['sell']:
-            print(f"  • {signal}")
+        lines.append(f"\n🔴 卖出信号 ({len(signals['sell'])}):")
+        lines.extend(f"  • {signal}" for signal in signals['sell'])
         
-        print(f"\n🟡 中性信号 ({len(signals['neutral'])}):")
-        for signal in signals['neutral']:
-            print(f"  • {signal}")
+        lines.append(f"\n🟡 中性信号 ({len(signals['neutral'])}):")
+        lines.extend(f"  • {signal}" for signal in signals['neutral'])
         
         # 综合建议
         if score > 30:
@@ -263,13 +347,15 @@ class StockAnalysisSystem:
             recommendation = "🔻 强烈卖出"
             color = "🔴"
         
-        print(f"\n{color} 综合评分: {score}/100")
-        print(f"💡 投资建议: {recommendation}")
+        lines.append(f"\n{color} 综合评分: {score}/100")
+        lines.append(f"💡 投资建议: {recommendation}")
+        
+        lines.append(f"\n⚠️ 风险提示:")
+        lines.append(f"  • 技术分析仅供参考，不构成投资建议")
+        lines.append(f"  • 股市有风险，投资需谨慎")
+        lines.append(f"  • 建议结合基本面分析做出投资决策")
         
-        print(f"\n⚠️ 风险提示:")
-        print(f"  • 技术分析仅供参考，不构成投资建议")
-        print(f"  • 股市有风险，投资需谨慎")
-        print(f"  • 建议结合基本面分析做出投资决策")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def display_batch_results(self, results: list):
         """显示批量分析结果"""
@@ -277,33 +363,49 @@ class StockAnalysisSystem:
         print(f"📊 批量分析结果 ({len(results)} 只股票)")
         print("=" * 80)
         
-        # 按评分排序
-        sorted_results = sorted(results, key=lambda x: x['signals']['score'], reverse=True)
+        # 评分一次性物化为数组，排序、建议分类和统计都在数组上完成
+        scores = np.fromiter((r['signals']['score'] for r in results), dtype=np.int64, count=len(results))
+        recommendations = np.where(scores > 10, "买入", np.where(scores > -10, "持有", "卖出"))
         
-        print(f"{'排名':<4} {'股票':<8} {'当前价格':<10} {'日涨跌':<10} {'评分':<8} {'建议':<12}")
-        print("-" * 80)
-        
-        for i, result in enumerate(sorted_results, 1):
-            symbol = result['symbol']
-            price = f"${result['current_price']:.2f}"
-            change = f"{result['price_change_pct']:+.2f}%"
-            score = result['signals']['score']
-            
-            if score > 10:
-                recommendation = "买入"
-            elif score > -10:
-                recommendation = "持有"
-            else:
-                recommendation = "卖出"
-            
-            print(f"{i:<4} {symbol:<8} {price:<10} {change:<10} {score:<8} {recommendation:<12}")
-        
-        print("-" * 80)
+        if len(results) > self.BATCH_TOP_K_THRESHOLD:
+            # 大批量时只对前K名排序 (线性选择 + K个元素排序)，其余按输入顺序列出
+            top = np.sort(np.argpartition(-scores, self.BATCH_TOP_K)[:self.BATCH_TOP_K])
+            top = top[np.argsort(-scores[top], kind='stable')]
+            others = np.setdiff1d(np.arange(len(results)), top)
+        else:
+            # 稳定排序，同分时保持输入顺序
+            top = np.argsort(-scores, kind='stable')
+            others = top[:0]
+        
+        # 各列整列格式化并补齐宽度，再拼接为每行文本，避免逐行逐字段格式化
+        prices = np.fromiter((r['current_price'] for r in results), dtype=np.float64, count=len(results))
+        changes = np.fromiter((r['price_change_pct'] for r in results), dtype=np.float64, count=len(results))
+        columns = [
+            np.char.ljust(np.array([r['symbol'] for r in results], dtype=str), 8),
+            np.char.ljust(np.char.mod('$%.2f', prices), 10),
+            np.char.ljust(np.char.add(np.char.mod('%+.2f', changes), '%'), 10),
+            np.char.ljust(np.char.mod('%d', scores), 8),
+            np.char.ljust(recommendations, 12),
+        ]
+        rows = columns[0]
+        for column in columns[1:]:
+            rows = np.char.add(np.char.add(rows, ' '), column)
+        
+        lines = [f"{'排名':<4} {'股票':<8} {'当前价格':<10} {'日涨跌':<10} {'评分':<8} {'建议':<12}", "-" * 80]
+        ranks = np.char.ljust(np.arange(1, len(top) + 1).astype(str), 4)
+        lines.extend(np.char.add(np.char.add(ranks, ' '), rows[top]))
+        
+        if len(others) > 0:
+            lines.append(f"\n📋 其他股票 ({len(others)} 只，未排序):")
+            lines.extend(np.char.add(f"{'-':<4} ", rows[others]))
+        
+        lines.append("-" * 80)
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # 统计信息
-        buy_count = sum(1 for r in results if r['signals']['score'] > 10)
-        hold_count = sum(1 for r in results if -10 <= r['signals']['score'] <= 10)
-        sell_count = sum(1 for r in results if r['signals']['score'] < -10)
+        buy_count = np.count_nonzero(scores > 10)
+        hold_count = np.count_nonzero((scores >= -10) & (scores <= 10))
+        sell_count = np.count_nonzero(scores < -10)
         
         print(f"📈 买入推荐: {buy_count} 只")
         print(f"⚖️ 持有推荐: {hold_count} 只")
@@ -314,20 +416,39 @@ class StockAnalysisSystem:
         print(f"\n📊 股票对比摘要:")
         print("-" * 50)
         
-        for symbol, data in stocks_data.items():
-            if len(data) > 1:
-                start_price = data['Close'].iloc[0]
-                end_price = data['Close'].iloc[-1]
-                total_return = (end_price / start_price - 1) * 100
-                
-                avg_volume = data['Volume'].mean()
-                volatility = data['Close'].pct_change().std() * 100
-                
-                print(f"{symbol}:")
-                print(f"  总收益率: {total_return:+.2f}%")
-                print(f"  平均成交量: {avg_volume:,.0f}")
-                print(f"  波动率: {volatility:.2f}%")
-                print()
+        symbols = [symbol for symbol, data in stocks_data.items() if len(data) > 1]
+        if not symbols:
+            return
+        
+        # 收盘价与成交量一次性按日期对齐后堆叠为二维数组 (行: 日期, 列: 股票)
+        # 前 n 列为收盘价、后 n 列为成交量，所有股票的统计量在一次数组运算中完成
+        n = len(symbols)
+        aligned = pd.concat([stocks_data[s]['Close'] for s in symbols] +
+                            [stocks_data[s]['Volume'] for s in symbols], axis=1)
+        stacked = aligned.to_numpy(dtype=np.float64)
+        closes = stacked[:, :n]
+        volumes = stacked[:, n:]
+        # 前值按各自上一个有效价格填充，收益率等价于逐只股票的 pct_change()
+        prev_closes = aligned.iloc[:, :n].ffill().to_numpy(dtype=np.float64)[:-1]
+        
+        # 各列首个/最后一个有效价格 (不同市场交易日不同，对齐后可能有缺失)
+        valid = ~np.isnan(closes)
+        columns = np.arange(len(symbols))
+        start_prices = closes[valid.argmax(axis=0), columns]
+        end_prices = closes[len(closes) - 1 - valid[::-1].argmax(axis=0), columns]
+        total_returns = (end_prices / start_prices - 1) * 100
+        
+        returns = (closes[1:] - prev_closes) / prev_closes
+        volatilities = np.nanstd(returns, axis=0, ddof=1) * 100
+        avg_volumes = np.nanmean(volumes, axis=0)
+        
+        for symbol, total_return, avg_volume, volatility in zip(symbols, total_returns,
+                                                                avg_volumes, volatilities):
+            print(f"{symbol}:")
+            print(f"  总收益率: {total_return:+.2f}%")
+            print(f"  平均成交量: {avg_volume:,.0f}")
+            print(f"  波动率: {volatility:.2f}%")
+            print()
     
     def run(self):
         """运行主程序"""
@@ -7,13 +7,21 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from crypto_data_fetcher import CryptoDataFetcher, get_popular_cryptos
+from crypto_data_fetcher import CryptoDataFetcher, get_popular_cryptos, KLINE_CACHE_TTL
 from technical_analyzer import TechnicalAnalyzer
-from visualizer import StockVisualizer
+from cache import cached_fetch
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
 
+# 共享的数据获取器：重复分析时复用同一个HTTP连接池
+_fetcher = CryptoDataFetcher()
+
+# 菜单选项 -> 数据粒度
+MENU_GRANULARITIES = {"1": "1day", "2": "1hour", "3": "15min"}
+
+
 def analyze_crypto(symbol: str, granularity: str = "1day", limit: int = 100):
     """
     分析单个加密货币
@@ -34,20 +42,28 @@ def analyze_crypto(symbol: str, granularity: str = "1day", limit: int = 100):
     print(f"{'='*60}")
     
     try:
-        # 1. 获取数据
-        fetcher = CryptoDataFetcher()
-        data = fetcher.get_crypto_data(symbol, granularity=granularity, limit=limit)
+        # 1. 获取数据 (优先读取本地缓存)
+        # 加密货币全天交易，最新K线 (含日线) 持续变化：磁盘缓存有效期与内存K线缓存一致
+        data = cached_fetch(symbol, str(limit),
+                            lambda: _fetcher.get_crypto_data(symbol, granularity=granularity, limit=limit),
+                            interval=granularity, ttl=KLINE_CACHE_TTL.get(granularity, 30.0))
         
         if data is None:
             print(f"❌ 无法获取 {symbol} 的数据")
             return None
             
+        # OHLCV一次性转为数组，最新值与极值都从同一份数组读取
+        ohlcv = data[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(dtype=np.float64)
+        latest_open, latest_high, latest_low, latest_close, latest_volume = ohlcv[-1]
+        start_date = data.index[0].strftime('%Y-%m-%d')
+        end_date = data.index[-1].strftime('%Y-%m-%d')
+        
         print(f"\n📈 数据概览:")
-        print(f"   时间范围: {data.index[0].strftime('%Y-%m-%d')} 到 {data.index[-1].strftime('%Y-%m-%d')}")
+        print(f"   时间范围: {start_date} 到 {end_date}")
         print(f"   数据条数: {len(data)} 条")
-        print(f"   最新价格: ${data['Close'].iloc[-1]:,.4f}")
-        print(f"   最高价格: ${data['High'].max():,.4f}")
-        print(f"   最低价格: ${data['Low'].min():,.4f}")
+        print(f"   最新价格: ${latest_close:,.4f}")
+        print(f"   最高价格: ${np.nanmax(ohlcv[:, 1]):,.4f}")
+        print(f"   最低价格: ${np.nanmin(ohlcv[:, 2]):,.4f}")
         
         # 2. 技术分析
         print("\n🔧 开始技术分析...")
@@ -61,17 +77,16 @@ def analyze_crypto(symbol: str, granularity: str = "1day", limit: int = 100):
         
         # 3. 显示结果
         print(f"\n📈 {symbol} 技术分析结果:")
-        print(f"数据时间范围: {data.index[0].strftime('%Y-%m-%d')} 到 {data.index[-1].strftime('%Y-%m-%d')}")
+        print(f"数据时间范围: {start_date} 到 {end_date}")
         print(f"总数据条数: {len(data)}")
         
         # 显示最新价格信息
-        latest = data.iloc[-1]
         print(f"\n💰 最新价格信息:")
-        print(f"收盘价: ${latest['Close']:.2f}")
-        print(f"开盘价: ${latest['Open']:.2f}")
-        print(f"最高价: ${latest['High']:.2f}")
-        print(f"最低价: ${latest['Low']:.2f}")
-        print(f"成交量: {latest['Volume']:,.0f}")
+        print(f"收盘价: ${latest_close:.2f}")
+        print(f"开盘价: ${latest_open:.2f}")
+        print(f"最高价: ${latest_high:.2f}")
+        print(f"最低价: ${latest_low:.2f}")
+        print(f"成交量: {latest_volume:,.0f}")
         
         # 显示技术指标
         print(f"\n📊 技术指标:")
@@ -176,6 +191,9 @@ def main():
     print("🎯 智能信号: 买入/卖出/持有建议")
     print("=" * 60)
     
+    # 后台预编译指标内核，用户输入期间完成JIT
+    TechnicalAnalyzer.start_warmup()
+    
     while True:
         print("\n🎛️  操作菜单:")
         print("1. 📈 分析加密货币")
@@ -199,8 +217,7 @@ def main():
                 print("3. 15min (15分钟线)")
                 
                 granularity_choice = input("选择粒度 (1-3, 默认1): ").strip() or "1"
-                granularity_map = {"1": "1day", "2": "1hour", "3": "15min"}
-                granularity = granularity_map.get(granularity_choice, "1day")
+                granularity = MENU_GRANULARITIES.get(granularity_choice, "1day")
                 
                 try:
                     limit = int(input("数据条数 (默认100): ").strip() or "100")
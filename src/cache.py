@@ -0,0 +1,185 @@
+"""
+数据缓存模块
+将获取到的行情数据持久化到本地磁盘，重复查询时直接读取，避免网络往返
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import pandas as pd
+from typing import Optional, Callable, Dict, Any
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# 默认缓存目录
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'stock-analyzer')
+
+# 缓存有效期(秒)：日内数据变化快，日线及以上数据变化慢
+INTRADAY_TTL = 5 * 60
+DAILY_TTL = 6 * 60 * 60
+
+
+def is_intraday(interval: str) -> bool:
+    """
+    判断数据间隔是否为日内级别
+
+    Args:
+        interval: 数据间隔 (股票格式如 '15m', '1h'；加密货币格式如 '15min', '1hour')
+
+    Returns:
+        bool: 是否为日内间隔
+    """
+    interval = interval.lower()
+    return interval.endswith(('m', 'min', 'h', 'hour'))
+
+
+def ttl_for_interval(interval: str) -> int:
+    """
+    根据数据间隔选择缓存有效期
+
+    Args:
+        interval: 数据间隔
+
+    Returns:
+        int: 有效期(秒)
+    """
+    return INTRADAY_TTL if is_intraday(interval) else DAILY_TTL
+
+
+class FileCache:
+    """基于parquet文件的行情数据缓存"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录 (默认 ~/.cache/stock-analyzer)
+        """
+        self.cache_dir = cache_dir
+
+    def _paths(self, symbol: str, period: str, interval: str) -> tuple:
+        """生成数据文件和元数据文件路径"""
+        # 新鲜度由元数据中的获取时间判断，过期文件保留以便增量更新
+        raw_key = f"{symbol}|{period}|{interval}"
+        digest = hashlib.md5(raw_key.encode('utf-8')).hexdigest()[:12]
+        safe_symbol = ''.join(ch if ch.isalnum() else '_' for ch in symbol)
+        base = os.path.join(self.cache_dir, f"{safe_symbol}_{period}_{digest}")
+        return base + '.parquet', base + '.meta.json'
+
+    def get(self, symbol: str, period: str, interval: str = '1d',
+            allow_stale: bool = False, ttl: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """
+        读取缓存数据
+
+        Args:
+            symbol: 代码
+            period: 时间周期 (加密货币为数据条数)
+            interval: 数据间隔
+            allow_stale: 是否返回已过期的数据 (用于只补取最新K线的增量更新)
+            ttl: 有效期(秒)，默认按数据间隔选择
+
+        Returns:
+            DataFrame: 命中且未过期 (或允许过期) 时返回缓存数据，否则返回None
+        """
+        data_path, meta_path = self._paths(symbol, period, interval)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+
+            # 过期或pandas版本变化均视为未命中
+            if ttl is None:
+                ttl = ttl_for_interval(interval)
+            if not allow_stale and time.time() - meta.get('fetched_at', 0) > ttl:
+                return None
+            if meta.get('pandas_version') != pd.__version__:
+                return None
+
+            return pd.read_parquet(data_path)
+        except Exception as e:
+            print(f"⚠️ 读取缓存失败 ({symbol}): {e}")
+            return None
+
+    def set(self, symbol: str, period: str, interval: str, data: pd.DataFrame) -> None:
+        """
+        写入缓存数据 (先写临时文件再原子替换)
+
+        Args:
+            symbol: 代码
+            period: 时间周期 (加密货币为数据条数)
+            interval: 数据间隔
+            data: 要缓存的数据
+        """
+        data_path, meta_path = self._paths(symbol, period, interval)
+        meta: Dict[str, Any] = {
+            'symbol': symbol,
+            'period': period,
+            'interval': interval,
+            'fetched_at': time.time(),
+            'pandas_version': pd.__version__,
+        }
+
+        tmp_paths = []
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            fd, tmp_data = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            tmp_paths.append(tmp_data)
+            os.close(fd)
+            data.to_parquet(tmp_data)
+            os.replace(tmp_data, data_path)
+
+            fd, tmp_meta = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            tmp_paths.append(tmp_meta)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_meta, meta_path)
+        except Exception as e:
+            print(f"⚠️ 写入缓存失败 ({symbol}): {e}")
+        finally:
+            # 写入失败时清理残留的临时文件 (成功替换后临时文件已不存在)
+            for tmp_path in tmp_paths:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+_default_cache = FileCache()
+
+
+def get_default_cache() -> FileCache:
+    """获取进程内共享的默认缓存"""
+    return _default_cache
+
+
+def cached_fetch(symbol: str, period: str, fetch_func: Callable[[], Optional[pd.DataFrame]],
+                 interval: str = '1d', ttl: Optional[float] = None) -> Optional[pd.DataFrame]:
+    """
+    优先从磁盘缓存读取数据，未命中时调用真实的获取函数并写入缓存
+
+    Args:
+        symbol: 代码
+        period: 时间周期 (加密货币为数据条数)
+        fetch_func: 无参数的数据获取函数
+        interval: 数据间隔
+        ttl: 有效期(秒)，默认按数据间隔选择
+
+    Returns:
+        DataFrame: 行情数据，失败返回None
+    """
+    data = _default_cache.get(symbol, period, interval, ttl=ttl)
+    if data is not None:
+        print(f"💾 使用缓存数据: {symbol} ({len(data)} 条)")
+        return data
+
+    data = fetch_func()
+    if data is not None and not data.empty:
+        _default_cache.set(symbol, period, interval, data)
+    return data
+
@@ -3,102 +3,552 @@
 支持从Bitget和Binance获取加密货币数据
 """
 
+import json
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import numpy as np
 import time
+import asyncio
 import random
+import functools
+import logging
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple, Callable, Iterator, AsyncIterator
 import warnings
 warnings.filterwarnings('ignore')
 
+# 逐次请求的过程信息走日志 (默认不输出)，最终结果与批量汇总仍直接打印
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    # orjson 解析K线这类大数组比标准库快2-3倍
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    # 未安装aiohttp时，批量获取退化为线程池并发
+    AIOHTTP_AVAILABLE = False
+
+
+def _in_event_loop() -> bool:
+    """当前线程是否已有运行中的事件循环 (如Jupyter或协程中调用同步接口，此时不能使用 asyncio.run)"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+# K线粒度格式转换 (Bitget -> Binance)
+BITGET_TO_BINANCE_INTERVAL = {
+    '1min': '1m', '5min': '5m', '15min': '15m', '30min': '30m',
+    '1h': '1h', '4h': '4h', '6h': '6h', '12h': '12h',
+    '1day': '1d', '1week': '1w'
+}
+
+
+class RateLimiter:
+    """
+    滑动窗口限流器 (线程安全)：任意 period 秒内最多放行 max_calls 次请求，
+    可选再限制任意60秒内的请求权重总和 (交易所按分钟计的权重额度)
+    """
+    
+    def __init__(self, max_calls: int, period: float = 1.0,
+                 max_weight_per_minute: Optional[int] = None):
+        """
+        初始化限流器
+        
+        Args:
+            max_calls: 窗口内允许的最大请求数
+            period: 窗口长度(秒)
+            max_weight_per_minute: 每分钟权重上限 (可选)
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self.max_weight_per_minute = max_weight_per_minute
+        self._calls = deque()
+        # 分钟窗口: (时间戳, 权重)，按时间戳升序
+        self._weights = deque()
+        self._used_weight = 0
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+    
+    def pause(self, seconds: float) -> None:
+        """
+        暂停放行一段时间 (服务器要求等待或额度即将用尽时使用)
+        
+        Args:
+            seconds: 暂停时长(秒)
+        """
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+    
+    def _expire(self, now: float) -> None:
+        """移除两个窗口中已过期的记录 (调用方需持有锁)"""
+        while self._calls and now - self._calls[0] >= self.period:
+            self._calls.popleft()
+        while self._weights and now - self._weights[0][0] >= 60.0:
+            self._used_weight -= self._weights.popleft()[1]
+    
+    def _reserve(self, weight: int = 1) -> float:
+        """尝试登记一次请求，成功返回0，否则返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._resume_at:
+                return self._resume_at - now
+            self._expire(now)
+            if len(self._calls) >= self.max_calls:
+                return self.period - (now - self._calls[0])
+            if (self.max_weight_per_minute is not None and self._weights
+                    and self._used_weight + weight > self.max_weight_per_minute):
+                return 60.0 - (now - self._weights[0][0])
+            self._calls.append(now)
+            if self.max_weight_per_minute is not None:
+                self._weights.append((now, weight))
+                self._used_weight += weight
+            return 0.0
+    
+    def sync_used_weight(self, used: int) -> None:
+        """
+        按服务器返回的本分钟已用权重校准分钟窗口
+        
+        服务器按自然分钟统计，本地少计的部分 (其他进程或重启前的请求) 补记在
+        本分钟开始时刻，到下一分钟开始时随服务器计数一同过期
+        
+        Args:
+            used: 服务器报告的已用权重
+        """
+        if self.max_weight_per_minute is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            missing = used - self._used_weight
+            if missing <= 0:
+                return
+            minute_start = now - time.time() % 60
+            position = sum(1 for stamp, _ in self._weights if stamp < minute_start)
+            self._weights.insert(position, (minute_start, missing))
+            self._used_weight += missing
+    
+    def acquire(self, weight: int = 1) -> None:
+        """
+        阻塞直到窗口内有剩余额度，并登记本次请求
+        
+        Args:
+            weight: 本次请求的权重 (仅在设置了每分钟权重上限时计入)
+        """
+        while True:
+            wait = self._reserve(weight)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self, weight: int = 1) -> None:
+        """acquire 的协程版本，等待期间不阻塞事件循环"""
+        while True:
+            wait = self._reserve(weight)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+# 协程等待并发名额时的轮询间隔(秒)
+RATE_SLOT_POLL_INTERVAL = 0.01
+
+
+class RateController:
+    """
+    AIMD并发控制器 (加性增、乘性减，与TCP拥塞控制同理)
+    
+    所有工作线程共享同一个并发上限：请求成功且平均延迟未超标时上限加 alpha，
+    遇到 429/5xx/网络错误或平均延迟超过目标值时上限乘以 beta，
+    使一个线程被限流时其他线程也同步减速
+    """
+    
+    def __init__(self, initial: float = 2.0, alpha: float = 0.5, beta: float = 0.5,
+                 c_min: int = 1, c_max: int = 8, latency_target: float = 1.5, window: int = 20):
+        """
+        初始化并发控制器
+        
+        Args:
+            initial: 初始并发数
+            alpha: 成功时的加性增量
+            beta: 失败时的乘性减因子
+            c_min: 最小并发数
+            c_max: 最大并发数
+            latency_target: 目标平均延迟(秒)
+            window: 延迟滑动窗口样本数
+        """
+        self.concurrency = float(initial)
+        self.alpha = alpha
+        self.beta = beta
+        self.c_min = c_min
+        self.c_max = c_max
+        self.latency_target = latency_target
+        self._latencies = deque(maxlen=window)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+    
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """占用一个并发名额，在途请求数达到当前上限时阻塞等待"""
+        with self._cond:
+            while self._in_flight >= max(int(self.concurrency), self.c_min):
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+    
+    @asynccontextmanager
+    async def slot_async(self) -> AsyncIterator[None]:
+        """slot 的协程版本，等待名额期间不阻塞事件循环"""
+        while True:
+            with self._cond:
+                if self._in_flight < max(int(self.concurrency), self.c_min):
+                    self._in_flight += 1
+                    break
+            await asyncio.sleep(RATE_SLOT_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+    
+    def on_success(self, latency: float) -> None:
+        """
+        记录一次成功请求
+        
+        Args:
+            latency: 请求耗时(秒)
+        """
+        with self._cond:
+            self._latencies.append(latency)
+            if sum(self._latencies) / len(self._latencies) > self.latency_target:
+                self._decrease()
+            else:
+                self.concurrency = min(self.concurrency + self.alpha, float(self.c_max))
+                self._cond.notify_all()
+    
+    def on_error(self) -> None:
+        """记录一次被限流、服务端错误或网络错误"""
+        with self._cond:
+            self._decrease()
+    
+    def record(self, status: int, latency: float) -> None:
+        """
+        按HTTP状态码记录请求结果 (429以外的4xx属于请求本身的问题，不影响并发)
+        
+        Args:
+            status: HTTP状态码
+            latency: 请求耗时(秒)
+        """
+        if status == 429 or status >= 500:
+            self.on_error()
+        elif status < 400:
+            self.on_success(latency)
+    
+    def _decrease(self) -> None:
+        """乘性减并清空延迟样本，以新的并发水平重新测量"""
+        self.concurrency = max(self.concurrency * self.beta, float(self.c_min))
+        self._latencies.clear()
+
+
+# Binance 每分钟请求权重上限，已用权重超过该比例时暂停到下一分钟
+BINANCE_WEIGHT_LIMIT_1M = 1200
+BINANCE_WEIGHT_PAUSE_RATIO = 0.9
+
+# 按交易所的公开限额限流 (按IP计，进程内所有获取器共享)
+# Bitget 行情接口 20次/秒 (1200次/分钟)；Binance 按每分钟请求权重计，另限10次/秒平滑突发
+BITGET_RATE_LIMITER = RateLimiter(20, 1.0)
+BINANCE_RATE_LIMITER = RateLimiter(10, 1.0, max_weight_per_minute=BINANCE_WEIGHT_LIMIT_1M)
+
+# 内存缓存有效期(秒)：行情快照变化以秒计，K线按粒度决定
+TICKER_CACHE_TTL = 10.0
+KLINE_CACHE_TTL = {
+    '1min': 5.0, '5min': 15.0, '15min': 30.0, '30min': 30.0,
+    '1h': 60.0, '4h': 60.0, '6h': 60.0, '12h': 60.0,
+    '1day': 60.0, '1week': 60.0
+}
+# 超过该时长的缓存条目在下次访问时清理
+CACHE_EVICT_AGE = 60.0
+
+
+def binance_kline_weight(limit: int) -> int:
+    """
+    Binance K线接口的请求权重 (随条数分档)
+    
+    Args:
+        limit: 请求条数
+        
+    Returns:
+        int: 请求权重
+    """
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+    
+    Args:
+        value: 头部值 (秒数或HTTP日期)
+        
+    Returns:
+        float: 需要等待的秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(retry_at.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def create_http_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """
+    创建带连接池的HTTP会话
+    
+    同一会话内的请求复用keep-alive连接，省去每次请求的TCP/TLS握手；
+    重试由获取器自行控制，适配器层不做重试
+    
+    Args:
+        pool_connections: 缓存的连接池数量 (按主机)
+        pool_maxsize: 每个连接池的最大连接数
+        
+    Returns:
+        requests.Session: 配置好的会话
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': 'crypto-stock-analyzer/1.0',
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+    })
+    return session
+
 
 class CryptoDataFetcher:
     """加密货币数据获取器 - 主要使用Bitget API，备选Binance API"""
     
-    def __init__(self, retry_count: int = 5, retry_delay: float = 2.0):
+    def __init__(self, retry_count: int = 5, retry_delay: float = 2.0,
+                 session: Optional[requests.Session] = None):
         """
         初始化加密货币数据获取器
         
         Args:
             retry_count: 重试次数 (默认5次)
             retry_delay: 基础重试延迟(秒，默认2秒)
+            session: HTTP会话 (默认新建带连接池的会话，由本获取器负责关闭)
         """
         self.retry_count = retry_count
         self.retry_delay = retry_delay
+        self._owns_session = session is None
+        # 批量并发时所有线程共享的AIMD并发控制
+        self.rate_controller = RateController()
+        
+        # 短期内存缓存: 键 -> (写入时间, 结果)，轮询同一交易对时免去重复请求
+        self._ticker_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._kline_cache: Dict[Tuple[str, str, int], Tuple[float, pd.DataFrame]] = {}
+        self._cache_lock = threading.Lock()
+        
+        # 进行中的请求: 同一参数的并发调用共享同一个Future，只发一次HTTP请求
+        self._inflight: Dict[Tuple[str, str, int], Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.session = session if session is not None else create_http_session()
         
         # Bitget API基础URL (免费，无需API密钥)
         self.bitget_base_url = "https://api.bitget.com/api/v2"
         
         # Binance API基础URL (免费，无需API密钥，作为备选)
         self.binance_base_url = "https://api.binance.com/api/v3"
+        
+        # 各接口完整地址 (构造时拼接一次)
+        self.bitget_candles_url = f"{self.bitget_base_url}/spot/market/candles"
+        self.bitget_tickers_url = f"{self.bitget_base_url}/spot/market/tickers"
+        self.binance_klines_url = f"{self.binance_base_url}/klines"
     
-    def get_crypto_data_bitget(self, symbol: str, granularity: str = "1day", 
-                              limit: int = 200) -> Optional[pd.DataFrame]:
+    def close(self) -> None:
+        """关闭自行创建的HTTP会话，释放连接池"""
+        if self._owns_session:
+            self.session.close()
+    
+    def __enter__(self) -> 'CryptoDataFetcher':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _request_with_retry(self, url: str, params: Dict[str, Any], limiter: RateLimiter,
+                            description: str,
+                            validate: Optional[Callable[[Any], bool]] = None,
+                            weight: int = 1) -> Optional[Any]:
         """
-        从Bitget获取加密货币K线数据
+        发送GET请求并解析JSON，按服务器给出的限流信息决定重试时机
+        
+        - 有 Retry-After 头时严格按其等待；Binance 已用权重接近上限时暂停到下一分钟
+        - 429 以外的 4xx (参数错误、交易对不存在、403/418 封禁等) 不可恢复，直接返回
+        - 服务器未给出等待时间时，退化为带随机抖动的指数退避
         
         Args:
-            symbol: 交易对符号 (如 'BTCUSDT', 'ETHUSDT')
-            granularity: K线粒度 ('1min', '5min', '15min', '30min', '1h', '4h', '6h', '12h', '1day', '1week')
-            limit: 数据条数 (最大200)
+            url: 请求地址
+            params: 查询参数
+            limiter: 对应交易所的限流器
+            description: 日志描述
+            validate: 结果校验函数，不通过时视为失败并重试
+            weight: 请求权重 (计入限流器的每分钟权重窗口)
             
         Returns:
-            DataFrame: 包含OHLCV数据的DataFrame，失败返回None
+            解析后的JSON，失败返回None
         """
         for attempt in range(self.retry_count):
+            server_delay = None
             try:
-                print(f"📊 从Bitget获取 {symbol} 数据 (粒度: {granularity}, 条数: {limit}) - 第 {attempt + 1} 次尝试...")
+                logger.debug("📊 %s - 第 %d 次尝试...", description, attempt + 1)
                 
-                # 添加随机延迟避免请求过于频繁
-                if attempt > 0:
-                    random_delay = random.uniform(1.0, 3.0)
-                    time.sleep(random_delay)
+                limiter.acquire(weight)
+                with self.rate_controller.slot():
+                    started = time.monotonic()
+                    try:
+                        response = self.session.get(url, params=params, timeout=30)
+                    except requests.RequestException:
+                        self.rate_controller.on_error()
+                        raise
+                self.rate_controller.record(response.status_code, time.monotonic() - started)
+                self._check_used_weight(response.headers, limiter)
                 
-                # 获取K线数据
-                url = f"{self.bitget_base_url}/spot/market/candles"
-                params = {
-                    'symbol': symbol.upper(),
-                    'granularity': granularity,
-                    'limit': min(limit, 200)  # Bitget限制最大200条
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
+                if 400 <= response.status_code < 500 and response.status_code != 429:
+                    logger.warning("⛔ 请求被拒绝 (HTTP %d)，不再重试", response.status_code)
+                    return None
+                server_delay = parse_retry_after(response.headers.get('Retry-After'))
                 response.raise_for_status()
                 
-                result = response.json()
+                result = json_loads(response.content)
+                if validate is None or validate(result):
+                    return result
                 
-                if result.get('code') == '00000' and result.get('data') and len(result['data']) > 0:
-                    # 转换为DataFrame
-                    df = self._convert_bitget_to_ohlcv(result['data'], symbol)
-                    print(f"✅ 成功获取 {len(df)} 条数据")
-                    return df
-                else:
-                    print(f"⚠️ 获取到空数据或API返回错误: {result.get('msg', '未知错误')}")
-                    
-            except Exception as e:
-                error_msg = str(e).lower()
-                print(f"❌ 第 {attempt + 1} 次尝试失败: {e}")
+                message = result.get('msg', '未知错误') if isinstance(result, dict) else '空数据'
+                logger.warning("⚠️ 获取到空数据或API返回错误: %s", message)
                 
-                if attempt < self.retry_count - 1:
+            except Exception as e:
+                logger.warning("❌ 第 %d 次尝试失败: %s", attempt + 1, e)
+            
+            if attempt < self.retry_count - 1:
+                if server_delay is not None:
+                    # 服务器明确给出了等待时间，所有线程一起暂停
+                    delay = server_delay
+                    limiter.pause(delay)
+                    logger.warning("🚫 服务器要求等待 %.1f 秒...", delay)
+                else:
                     # 指数退避策略
-                    delay = self.retry_delay * (2 ** attempt) + random.uniform(1, 3)
-                    
-                    # 如果是请求频率限制，延迟更长时间
-                    if "429" in error_msg or "rate limit" in error_msg:
-                        delay = max(delay, 10 + random.uniform(5, 15))
-                        print(f"🚫 检测到请求频率限制，延长等待时间...")
-                    
-                    print(f"⏳ {delay:.1f} 秒后重试...")
-                    time.sleep(delay)
+                    delay = self.retry_delay * (2 ** attempt) + random.uniform(1, 2)
+                logger.debug("⏳ %.1f 秒后重试...", delay)
+                time.sleep(delay)
         
-        print(f"❌ 获取 {symbol} 数据失败，已尝试 {self.retry_count} 次")
+        print(f"❌ {description} 失败，已尝试 {self.retry_count} 次")
         return None
     
+    @staticmethod
+    def _check_used_weight(headers: Mapping[str, str], limiter: RateLimiter) -> None:
+        """按 Binance 响应头中的已用权重校准限流器，接近每分钟上限时暂停到下一分钟开始"""
+        used = headers.get('X-MBX-USED-WEIGHT-1M')
+        if used is None:
+            return
+        try:
+            used_weight = int(used)
+        except ValueError:
+            return
+        limiter.sync_used_weight(used_weight)
+        if used_weight >= BINANCE_WEIGHT_LIMIT_1M * BINANCE_WEIGHT_PAUSE_RATIO:
+            wait = 60 - time.time() % 60
+            logger.warning("🚫 Binance 已用权重 %d/%d，暂停 %.1f 秒", used_weight, BINANCE_WEIGHT_LIMIT_1M, wait)
+            limiter.pause(wait)
+    
+    def get_crypto_data_bitget(self, symbol: str, granularity: str = "1day", 
+                              limit: int = 200) -> Optional[pd.DataFrame]:
+        """
+        从Bitget获取加密货币K线数据
+        
+        Args:
+            symbol: 交易对符号 (如 'BTCUSDT', 'ETHUSDT')
+            granularity: K线粒度 ('1min', '5min', '15min', '30min', '1h', '4h', '6h', '12h', '1day', '1week')
+            limit: 数据条数 (最大200)
+            
+        Returns:
+            DataFrame: 包含OHLCV数据的DataFrame，失败返回None
+        """
+        url = self.bitget_candles_url
+        params = {
+            'symbol': symbol.upper(),
+            'granularity': granularity,
+            'limit': min(limit, 200)  # Bitget限制最大200条
+        }
+        
+        result = self._request_with_retry(
+            url, params, BITGET_RATE_LIMITER,
+            f"从Bitget获取 {symbol} 数据 (粒度: {granularity}, 条数: {limit})",
+            validate=lambda r: isinstance(r, dict) and r.get('code') == '00000' and bool(r.get('data'))
+        )
+        if result is None:
+            print(f"❌ 获取 {symbol} 数据失败")
+            return None
+        
+        # 转换为DataFrame
+        df = self._convert_bitget_to_ohlcv(result['data'])
+        logger.debug("✅ 成功获取 %d 条数据", len(df))
+        return df
+    
+    def _cache_get(self, cache: dict, key, ttl: float):
+        """读取未过期的缓存条目，并顺带清理过老的条目"""
+        now = time.monotonic()
+        with self._cache_lock:
+            for stale in [k for k, (stamp, _) in cache.items() if now - stamp > max(CACHE_EVICT_AGE, ttl)]:
+                del cache[stale]
+            entry = cache.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        return None
+    
+    def _cache_set(self, cache: dict, key, value) -> None:
+        """写入缓存条目"""
+        with self._cache_lock:
+            cache[key] = (time.monotonic(), value)
+    
     def get_crypto_data(self, symbol: str, granularity: str = "1day", 
                        limit: int = 200) -> Optional[pd.DataFrame]:
         """
-        获取加密货币数据 - 优先使用Bitget，失败时使用Binance
+        获取加密货币数据 - 优先使用Bitget，失败时使用Binance (短期内重复请求直接返回缓存)
         
         Args:
             symbol: 交易对符号 (如 'BTCUSDT', 'ETHUSDT')
@@ -108,31 +558,92 @@ class CryptoDataFetcher:
         Returns:
             DataFrame: 包含OHLCV数据的DataFrame，失败返回None
         """
-        print(f"🎯 开始获取 {symbol} 数据...")
+        key = (symbol.upper(), granularity, limit)
+        cached = self._cached_klines(key)
+        if cached is not None:
+            return cached
+        
+        future, owner = self._claim_inflight(key)
+        if not owner:
+            logger.debug("🔗 等待进行中的 %s 请求...", symbol)
+            return self._copy_frame(future.result())
+        
+        try:
+            data = self._get_crypto_data_uncached(symbol, granularity, limit)
+        except BaseException as e:
+            self._finish_inflight(key, future, exception=e)
+            raise
+        self._finish_inflight(key, future, data)
+        return data
+    
+    @staticmethod
+    def _copy_frame(data: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """返回缓存数据的副本，调用方修改返回值不会影响缓存及其他调用方"""
+        return None if data is None else data.copy()
+    
+    def _cached_klines(self, key: Tuple[str, str, int]) -> Optional[pd.DataFrame]:
+        """读取未过期的K线内存缓存 (有效期按粒度决定，返回副本)"""
+        cached = self._cache_get(self._kline_cache, key, KLINE_CACHE_TTL.get(key[1], 30.0))
+        if cached is not None:
+            logger.debug("⚡ 使用内存缓存: %s (%d 条)", key[0], len(cached))
+        return self._copy_frame(cached)
+    
+    def _claim_inflight(self, key: Tuple[str, str, int]) -> Tuple[Future, bool]:
+        """
+        登记一次K线请求：同一参数已有进行中的请求时返回其Future
+        
+        Returns:
+            tuple: (Future, 是否由调用方负责发起请求)
+        """
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is not None:
+                return pending, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+    
+    def _finish_inflight(self, key: Tuple[str, str, int], future: Future,
+                         data: Optional[pd.DataFrame] = None,
+                         exception: Optional[BaseException] = None) -> None:
+        """
+        写入缓存并唤醒等待同一请求的调用方 (线程与协程)
+        
+        缓存与Future保存的是独立副本，发起请求的调用方可以随意修改自己拿到的 data；
+        命中缓存和等待Future的调用方各自再取副本
+        """
+        stored = self._copy_frame(data) if exception is None else None
+        if stored is not None:
+            self._cache_set(self._kline_cache, key, stored)
+        with self._inflight_lock:
+            del self._inflight[key]
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(stored)
+    
+    def _get_crypto_data_uncached(self, symbol: str, granularity: str, limit: int) -> Optional[pd.DataFrame]:
+        """依次从Bitget、Binance获取K线数据 (不经过缓存)"""
+        logger.debug("🎯 开始获取 %s 数据...", symbol)
         
         # 首先尝试Bitget
-        print("🔄 尝试从Bitget获取数据...")
+        logger.debug("🔄 尝试从Bitget获取数据...")
         data = self.get_crypto_data_bitget(symbol, granularity, limit)
         
         if data is not None:
-            print("✅ Bitget数据获取成功")
+            logger.debug("✅ Bitget数据获取成功")
             return data
         
         # Bitget失败，尝试Binance
-        print("🔄 Bitget失败，尝试从Binance获取数据...")
+        logger.debug("🔄 Bitget失败，尝试从Binance获取数据...")
         
         # 转换粒度格式 (Bitget -> Binance)
-        granularity_map = {
-            '1min': '1m', '5min': '5m', '15min': '15m', '30min': '30m',
-            '1h': '1h', '4h': '4h', '6h': '6h', '12h': '12h',
-            '1day': '1d', '1week': '1w'
-        }
-        binance_interval = granularity_map.get(granularity, '1d')
+        binance_interval = BITGET_TO_BINANCE_INTERVAL.get(granularity, '1d')
         
         data = self.get_crypto_data_binance(symbol, binance_interval, limit)
         
         if data is not None:
-            print("✅ Binance数据获取成功")
+            logger.debug("✅ Binance数据获取成功")
             return data
         
         print("❌ 所有数据源都失败")
@@ -151,57 +662,31 @@ class CryptoDataFetcher:
         Returns:
             DataFrame: 包含OHLCV数据的DataFrame，失败返回None
         """
-        for attempt in range(self.retry_count):
-            try:
-                print(f"📊 从Binance获取 {symbol} 数据 (间隔: {interval}, 条数: {limit}) - 第 {attempt + 1} 次尝试...")
-                
-                # 添加随机延迟避免请求过于频繁
-                if attempt > 0:
-                    random_delay = random.uniform(0.5, 2.0)
-                    time.sleep(random_delay)
-                
-                url = f"{self.binance_base_url}/klines"
-                params = {
-                    'symbol': symbol.upper(),
-                    'interval': interval,
-                    'limit': min(limit, 1000)  # Binance限制最大1000条
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if data and len(data) > 0:
-                    # 转换为DataFrame
-                    df = self._convert_binance_to_ohlcv(data, symbol)
-                    print(f"✅ 成功获取 {len(df)} 条数据")
-                    return df
-                else:
-                    print(f"⚠️ 获取到空数据")
-                    
-            except Exception as e:
-                error_msg = str(e).lower()
-                print(f"❌ 第 {attempt + 1} 次尝试失败: {e}")
-                
-                if attempt < self.retry_count - 1:
-                    # 指数退避策略
-                    delay = self.retry_delay * (2 ** attempt) + random.uniform(1, 2)
-                    
-                    # 如果是请求频率限制，延迟更长时间
-                    if "429" in error_msg or "rate limit" in error_msg:
-                        delay = max(delay, 5 + random.uniform(2, 8))
-                        print(f"🚫 检测到请求频率限制，延长等待时间...")
-                    
-                    print(f"⏳ {delay:.1f} 秒后重试...")
-                    time.sleep(delay)
+        url = self.binance_klines_url
+        params = {
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'limit': min(limit, 1000)  # Binance限制最大1000条
+        }
         
-        print(f"❌ 获取 {symbol} 数据失败，已尝试 {self.retry_count} 次")
-        return None
+        data = self._request_with_retry(
+            url, params, BINANCE_RATE_LIMITER,
+            f"从Binance获取 {symbol} 数据 (间隔: {interval}, 条数: {limit})",
+            validate=lambda r: isinstance(r, list) and len(r) > 0,
+            weight=binance_kline_weight(params['limit'])
+        )
+        if data is None:
+            print(f"❌ 获取 {symbol} 数据失败")
+            return None
+        
+        # 转换为DataFrame
+        df = self._convert_binance_to_ohlcv(data)
+        logger.debug("✅ 成功获取 %d 条数据", len(df))
+        return df
     
     def get_crypto_info(self, symbol: str) -> Dict[str, Any]:
         """
-        获取加密货币基本信息 - 从Bitget获取ticker信息
+        获取加密货币基本信息 - 从Bitget获取ticker信息 (10秒内重复请求直接返回缓存)
         
         Args:
             symbol: 交易对符号 (如 'BTCUSDT', 'ETHUSDT')
@@ -209,15 +694,27 @@ class CryptoDataFetcher:
         Returns:
             Dict: 加密货币基本信息
         """
+        key = symbol.upper()
+        cached = self._cache_get(self._ticker_cache, key, TICKER_CACHE_TTL)
+        if cached is not None:
+            return dict(cached)
+        
+        info = self._get_crypto_info_uncached(symbol)
+        if 'error' not in info:
+            self._cache_set(self._ticker_cache, key, info)
+        return dict(info)
+    
+    def _get_crypto_info_uncached(self, symbol: str) -> Dict[str, Any]:
+        """从Bitget获取ticker信息 (不经过缓存)"""
         try:
             # 从Bitget获取ticker信息
-            url = f"{self.bitget_base_url}/spot/market/tickers"
+            url = self.bitget_tickers_url
             params = {'symbol': symbol.upper()}
             
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._request_with_retry(url, params, BITGET_RATE_LIMITER,
+                                              f"获取 {symbol} 基本信息")
+            if result is None:
+                return {'symbol': symbol, 'error': '请求失败'}
             
             if result.get('code') == '00000' and result.get('data'):
                 data_list = result['data']
@@ -264,7 +761,7 @@ class CryptoDataFetcher:
     def get_multiple_cryptos(self, symbols: List[str], granularity: str = "1day", 
                            limit: int = 200) -> Dict[str, pd.DataFrame]:
         """
-        批量获取多个加密货币数据
+        批量获取多个加密货币数据 (优先使用异步实现；未安装aiohttp或已在事件循环中调用时使用线程池)
         
         Args:
             symbols: 加密货币符号列表 (如 ['BTCUSDT', 'ETHUSDT'])
@@ -274,89 +771,270 @@ class CryptoDataFetcher:
         Returns:
             Dict: 加密货币符号为键，DataFrame为值的字典
         """
+        # 安装了aiohttp时在单线程事件循环中完成全部请求
+        if AIOHTTP_AVAILABLE and not _in_event_loop():
+            return asyncio.run(self.get_multiple_cryptos_async(symbols, granularity, limit))
+        
         results = {}
         total_symbols = len(symbols)
         
         print(f"🔄 开始批量获取 {total_symbols} 个加密货币数据...")
         
-        for i, symbol in enumerate(symbols, 1):
-            print(f"\n📈 处理第 {i}/{total_symbols} 个: {symbol}")
+        # 并发获取：线程数按并发上限分配，实际在途请求数由AIMD控制器动态调节，
+        # 请求频率由交易所限流器统一控制，无需在交易对之间固定等待
+        frames = {}
+        with ThreadPoolExecutor(max_workers=self.rate_controller.c_max) as executor:
+            futures = {executor.submit(self.get_crypto_data, symbol, granularity, limit): symbol
+                       for symbol in symbols}
+            for i, future in enumerate(as_completed(futures), 1):
+                symbol = futures[future]
+                try:
+                    frames[symbol] = future.result()
+                except Exception as e:
+                    print(f"❌ {symbol} 获取异常: {e}")
+                    frames[symbol] = None
+                
+                status = "✅ 数据获取成功" if frames[symbol] is not None else "❌ 数据获取失败"
+                logger.debug("📈 [%d/%d] %s %s", i, total_symbols, symbol, status)
+        
+        # 按输入顺序返回
+        for symbol in symbols:
+            if frames.get(symbol) is not None:
+                results[symbol] = frames[symbol]
+        
+        print(f"\n🎯 批量获取完成: 成功 {len(results)}/{total_symbols} 个加密货币")
+        return results
+    
+    async def _aget_json(self, session: 'aiohttp.ClientSession', url: str, params: Dict[str, Any],
+                         limiter: RateLimiter, description: str,
+                         validate: Optional[Callable[[Any], bool]] = None,
+                         weight: int = 1) -> Optional[Any]:
+        """
+        _request_with_retry 的协程版本：限流、AIMD并发控制、Retry-After 与重试策略相同
+        
+        Args:
+            session: aiohttp会话
+            url: 请求地址
+            params: 查询参数
+            limiter: 对应交易所的限流器
+            description: 日志描述
+            validate: 结果校验函数，不通过时视为失败并重试
+            weight: 请求权重 (计入限流器的每分钟权重窗口)
             
-            # 使用主要获取方法（优先Bitget，备选Binance）
-            data = self.get_crypto_data(symbol, granularity, limit)
+        Returns:
+            解析后的JSON，失败返回None
+        """
+        for attempt in range(self.retry_count):
+            server_delay = None
+            try:
+                logger.debug("📊 %s - 第 %d 次尝试...", description, attempt + 1)
+                
+                await limiter.acquire_async(weight)
+                async with self.rate_controller.slot_async():
+                    started = time.monotonic()
+                    try:
+                        async with session.get(url, params=params) as response:
+                            status = response.status
+                            headers = response.headers
+                            content = await response.read()
+                            request_info, history = response.request_info, response.history
+                    except (aiohttp.ClientError, asyncio.TimeoutError):
+                        self.rate_controller.on_error()
+                        raise
+                self.rate_controller.record(status, time.monotonic() - started)
+                self._check_used_weight(headers, limiter)
+                
+                if 400 <= status < 500 and status != 429:
+                    logger.warning("⛔ 请求被拒绝 (HTTP %d)，不再重试", status)
+                    return None
+                server_delay = parse_retry_after(headers.get('Retry-After'))
+                if status >= 400:
+                    raise aiohttp.ClientResponseError(request_info, history, status=status,
+                                                      message=f"HTTP {status}")
+                
+                result = json_loads(content)
+                if validate is None or validate(result):
+                    return result
+                
+                message = result.get('msg', '未知错误') if isinstance(result, dict) else '空数据'
+                logger.warning("⚠️ 获取到空数据或API返回错误: %s", message)
+                
+            except Exception as e:
+                logger.warning("❌ 第 %d 次尝试失败: %s", attempt + 1, e)
             
-            if data is not None:
-                results[symbol] = data
-                print(f"✅ {symbol} 数据获取成功")
-            else:
-                print(f"❌ {symbol} 数据获取失败")
+            if attempt < self.retry_count - 1:
+                if server_delay is not None:
+                    # 服务器明确给出了等待时间，所有请求一起暂停
+                    delay = server_delay
+                    limiter.pause(delay)
+                    logger.warning("🚫 服务器要求等待 %.1f 秒...", delay)
+                else:
+                    # 指数退避策略
+                    delay = self.retry_delay * (2 ** attempt) + random.uniform(1, 2)
+                logger.debug("⏳ %.1f 秒后重试...", delay)
+                await asyncio.sleep(delay)
+        
+        print(f"❌ {description} 失败，已尝试 {self.retry_count} 次")
+        return None
+    
+    async def aget_crypto_data(self, symbol: str, granularity: str = "1day", limit: int = 200,
+                               session: Optional['aiohttp.ClientSession'] = None) -> Optional[pd.DataFrame]:
+        """
+        异步获取加密货币数据 - 优先使用Bitget，失败时使用Binance
+        
+        与 get_crypto_data 共用内存缓存与进行中请求表，线程与协程之间的重复请求同样只发一次
+        
+        Args:
+            symbol: 交易对符号 (如 'BTCUSDT', 'ETHUSDT')
+            granularity: K线粒度 (Bitget格式: '1day', '1h' 等)
+            limit: 数据条数
+            session: aiohttp会话 (默认新建，批量获取时传入共享会话以复用连接)
             
-            # 批量请求时增加延迟，避免API限制
-            if i < total_symbols:  # 不是最后一个
-                delay = random.uniform(3.0, 6.0)  # 增加延迟时间
-                print(f"⏳ 等待 {delay:.1f} 秒后处理下一个...")
-                time.sleep(delay)
+        Returns:
+            DataFrame: 包含OHLCV数据的DataFrame，失败返回None
+        """
+        if session is None:
+            async with self._new_async_session() as own_session:
+                return await self.aget_crypto_data(symbol, granularity, limit, own_session)
+        
+        key = (symbol.upper(), granularity, limit)
+        cached = self._cached_klines(key)
+        if cached is not None:
+            return cached
+        
+        future, owner = self._claim_inflight(key)
+        if not owner:
+            logger.debug("🔗 等待进行中的 %s 请求...", symbol)
+            return self._copy_frame(await asyncio.wrap_future(future))
+        
+        try:
+            data = await self._aget_crypto_data_uncached(session, symbol, granularity, limit)
+        except BaseException as e:
+            self._finish_inflight(key, future, exception=e)
+            raise
+        self._finish_inflight(key, future, data)
+        return data
+    
+    async def _aget_crypto_data_uncached(self, session: 'aiohttp.ClientSession', symbol: str,
+                                         granularity: str, limit: int) -> Optional[pd.DataFrame]:
+        """依次从Bitget、Binance异步获取K线数据 (不经过缓存)"""
+        # 首先尝试Bitget
+        result = await self._aget_json(
+            session, self.bitget_candles_url, {
+                'symbol': symbol.upper(),
+                'granularity': granularity,
+                'limit': min(limit, 200)  # Bitget限制最大200条
+            }, BITGET_RATE_LIMITER,
+            f"从Bitget获取 {symbol} 数据 (粒度: {granularity}, 条数: {limit})",
+            validate=lambda r: isinstance(r, dict) and r.get('code') == '00000' and bool(r.get('data'))
+        )
+        if result is not None:
+            logger.debug("✅ Bitget %s 数据获取成功", symbol)
+            return self._convert_bitget_to_ohlcv(result['data'])
+        
+        # Bitget失败，尝试Binance
+        logger.debug("🔄 Bitget %s 失败，尝试从Binance获取数据...", symbol)
+        interval = BITGET_TO_BINANCE_INTERVAL.get(granularity, '1d')
+        data = await self._aget_json(
+            session, self.binance_klines_url, {
+                'symbol': symbol.upper(),
+                'interval': interval,
+                'limit': min(limit, 1000)  # Binance限制最大1000条
+            }, BINANCE_RATE_LIMITER,
+            f"从Binance获取 {symbol} 数据 (间隔: {interval}, 条数: {limit})",
+            validate=lambda r: isinstance(r, list) and len(r) > 0,
+            weight=binance_kline_weight(min(limit, 1000))
+        )
+        if data is not None:
+            logger.debug("✅ Binance %s 数据获取成功", symbol)
+            return self._convert_binance_to_ohlcv(data)
+        
+        print(f"❌ {symbol} 所有数据源都失败")
+        return None
+    
+    async def get_multiple_cryptos_async(self, symbols: List[str], granularity: str = "1day",
+                                         limit: int = 200) -> Dict[str, pd.DataFrame]:
+        """
+        异步批量获取多个加密货币数据 (缓存、去重与限流行为与 get_multiple_cryptos 相同)
+        
+        Args:
+            symbols: 加密货币符号列表 (如 ['BTCUSDT', 'ETHUSDT'])
+            granularity: K线粒度 (默认 '1day')
+            limit: 数据条数 (默认 200)
+            
+        Returns:
+            Dict: 加密货币符号为键，DataFrame为值的字典 (仅包含成功的交易对，保持输入顺序)
+        """
+        total_symbols = len(symbols)
+        print(f"🔄 开始异步批量获取 {total_symbols} 个加密货币数据...")
+        
+        frames = await self._aget_many(symbols, granularity, limit)
+        results = {symbol: data for symbol, data in zip(symbols, frames) if data is not None}
         
         print(f"\n🎯 批量获取完成: 成功 {len(results)}/{total_symbols} 个加密货币")
         return results
     
-    def _convert_bitget_to_ohlcv(self, data: List, symbol: str) -> pd.DataFrame:
+    async def _aget_many(self, symbols: List[str], granularity: str,
+                         limit: int) -> List[Optional[pd.DataFrame]]:
+        """
+        在同一个aiohttp会话中并发获取所有交易对
+        
+        同时处理的交易对数与线程池实现的线程数相同，实际在途请求数由AIMD控制器调节
+        """
+        semaphore = asyncio.Semaphore(self.rate_controller.c_max)
+        
+        async def fetch(symbol: str, session: 'aiohttp.ClientSession') -> Optional[pd.DataFrame]:
+            async with semaphore:
+                return await self.aget_crypto_data(symbol, granularity, limit, session)
+        
+        async with self._new_async_session() as session:
+            return await asyncio.gather(*(fetch(symbol, session) for symbol in symbols))
+    
+    def _new_async_session(self) -> 'aiohttp.ClientSession':
+        """创建带连接池上限的aiohttp会话"""
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10),
+                                     timeout=aiohttp.ClientTimeout(total=30))
+    
+    @staticmethod
+    def _klines_to_ohlcv(data: List) -> pd.DataFrame:
+        """
+        按列批量转换K线数组 (前6列均为: 时间戳(毫秒), 开, 高, 低, 收, 量)
+        
+        Args:
+            data: K线数据 (二维列表，数值可能为字符串)
+            
+        Returns:
+            DataFrame: 以时间为索引的OHLCV数据
+        """
+        klines = np.asarray(data, dtype=object)[:, :6]
+        index = pd.DatetimeIndex(pd.to_datetime(klines[:, 0].astype(np.int64), unit='ms'), name='timestamp')
+        return pd.DataFrame(klines[:, 1:6].astype(np.float64),
+                            columns=['Open', 'High', 'Low', 'Close', 'Volume'], index=index)
+    
+    def _convert_bitget_to_ohlcv(self, data: List) -> pd.DataFrame:
         """
         将Bitget K线数据转换为标准OHLCV格式
         
         Args:
-            data: Bitget API返回的K线数据
-            symbol: 交易对符号
+            data: Bitget API返回的K线数据 [timestamp, open, high, low, close, volume, quoteVolume]
             
         Returns:
             DataFrame: 标准OHLCV格式的DataFrame
         """
-        df_data = []
-        for kline in data:
-            # Bitget K线数据格式: [timestamp, open, high, low, close, volume, quoteVolume]
-            df_data.append({
-                'timestamp': pd.to_datetime(int(kline[0]), unit='ms'),
-                'Open': float(kline[1]),
-                'High': float(kline[2]),
-                'Low': float(kline[3]),
-                'Close': float(kline[4]),
-                'Volume': float(kline[5])
-            })
-        
-        df = pd.DataFrame(df_data)
-        df.set_index('timestamp', inplace=True)
-        
         # 按时间排序（从旧到新）
-        df = df.sort_index()
-        
-        return df
+        return self._klines_to_ohlcv(data).sort_index()
     
-    def _convert_binance_to_ohlcv(self, data: List, symbol: str) -> pd.DataFrame:
+    def _convert_binance_to_ohlcv(self, data: List) -> pd.DataFrame:
         """
         将Binance K线数据转换为标准OHLCV格式
         
         Args:
             data: Binance API返回的K线数据
-            symbol: 交易对符号
             
         Returns:
             DataFrame: 标准OHLCV格式的DataFrame
         """
-        df_data = []
-        for kline in data:
-            df_data.append({
-                'timestamp': pd.to_datetime(int(kline[0]), unit='ms'),
-                'Open': float(kline[1]),
-                'High': float(kline[2]),
-                'Low': float(kline[3]),
-                'Close': float(kline[4]),
-                'Volume': float(kline[5])
-            })
-        
-        df = pd.DataFrame(df_data)
-        df.set_index('timestamp', inplace=True)
-        
-        return df
+        return self._klines_to_ohlcv(data)
 
 
 # 常用加密货币交易对符号
@@ -370,9 +1048,10 @@ POPULAR_CRYPTOS = {
 }
 
 
-def get_popular_cryptos() -> Dict[str, List[str]]:
-    """获取常用加密货币交易对符号分类"""
-    return POPULAR_CRYPTOS
+@functools.lru_cache(maxsize=1)
+def get_popular_cryptos() -> Mapping[str, Tuple[str, ...]]:
+    """获取常用加密货币交易对符号分类 (只读，首次调用后缓存)"""
+    return MappingProxyType({category: tuple(symbols) for category, symbols in POPULAR_CRYPTOS.items()})
 
 
 def create_fetcher(retry_count: int = 3, retry_delay: float = 2.0) -> CryptoDataFetcher:
@@ -389,6 +1068,17 @@ def create_fetcher(retry_count: int = 3, retry_delay: float = 2.0) -> CryptoData
     return CryptoDataFetcher(retry_count=retry_count, retry_delay=retry_delay)
 
 
+@functools.lru_cache(maxsize=1)
+def get_default_fetcher() -> CryptoDataFetcher:
+    """
+    获取模块级共享的数据获取器 (首次调用时创建)，便捷函数之间复用同一个连接池
+    
+    Returns:
+        CryptoDataFetcher: 共享的数据获取器实例
+    """
+    return create_fetcher()
+
+
 def quick_get_crypto_data(symbol: str, days: int = 30) -> Optional[pd.DataFrame]:
     """
     快速获取加密货币数据的便捷函数
@@ -400,7 +1090,7 @@ def quick_get_crypto_data(symbol: str, days: int = 30) -> Optional[pd.DataFrame]
     Returns:
         DataFrame: OHLCV数据，失败返回None
     """
-    fetcher = create_fetcher()
+    fetcher = get_default_fetcher()
     return fetcher.get_crypto_data(symbol, granularity="1day", limit=days)
 
 
@@ -414,5 +1104,5 @@ def quick_get_crypto_info(symbol: str) -> Dict[str, Any]:
     Returns:
         Dict: 基本信息字典
     """
-    fetcher = create_fetcher()
+    fetcher = get_default_fetcher()
     return fetcher.get_crypto_info(symbol)
\ No newline at end of file
@@ -7,10 +7,10 @@
 
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import seaborn as sns
 from typing import Dict, Any, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
@@ -19,17 +19,35 @@ warnings.filterwarnings('ignore')
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Arial Unicode MS']
 plt.rcParams['axes.unicode_minus'] = False
 
+# 相关矩阵缓存的最大条目数
+CORRELATION_CACHE_SIZE = 32
+
+# K线实体/柱状图宽度: 16小时 (日期坐标单位为天)
+BAR_WIDTH = 16 / 24
+
+
 class CryptoVisualizer:
     """加密货币可视化类"""
     
-    def __init__(self, figsize: Tuple[int, int] = (15, 10)):
+    def __init__(self, figsize: Tuple[int, int] = (15, 10), save_dpi: int = 150,
+                 tight_bbox: bool = False, batch_mode: bool = False):
         """
         初始化可视化器
         
         Args:
             figsize: 图表大小 (宽, 高)
+            save_dpi: 保存图片的分辨率
+            tight_bbox: 保存时是否裁剪空白边距 (需要额外一次渲染)
+            batch_mode: 批量模式，不保存时只刷新画布而不弹出窗口
         """
         self.figsize = figsize
+        self.save_dpi = save_dpi
+        self.tight_bbox = tight_bbox
+        self.batch_mode = batch_mode
+        # 按布局缓存的图表: (行数, 列数, 高度比例, 尺寸) -> Figure，重复绘图时复用
+        self._fig_cache: Dict[Tuple[int, int, Optional[tuple], tuple], Figure] = {}
+        # 收益率相关矩阵缓存: ((币种, 最后时间戳, 长度), ...) -> 相关矩阵
+        self._corr_cache: Dict[tuple, pd.DataFrame] = {}
         self.colors = {
             'up': '#00ff88',      # 上涨绿色
             'down': '#ff4444',    # 下跌红色
@@ -50,84 +68,119 @@ class CryptoVisualizer:
             symbol: 加密货币符号
             save_path: 保存路径 (可选)
         """
-        fig, axes = plt.subplots(4, 1, figsize=self.figsize, 
-                                gridspec_kw={'height_ratios': [3, 1, 1, 1]})
+        fig, axes = self._get_figure(4, height_ratios=(3, 1, 1, 1))
         fig.suptitle(f'{symbol} 技术分析图表', fontsize=16, fontweight='bold')
         
+        # 日期坐标只转换一次，各子图共用
+        x = mdates.date2num(data.index.to_pydatetime())
+        x_indicators = x if indicators.index.equals(data.index) else None
+        
         # 1. K线图和均线
-        self._plot_candlestick(axes[0], data, indicators, symbol)
+        self._plot_candlestick(axes[0], data, indicators, symbol, x)
         
         # 2. 成交量
-        self._plot_volume(axes[1], data)
+        self._plot_volume(axes[1], data, x)
         
         # 3. RSI指标
-        self._plot_rsi(axes[2], indicators)
+        self._plot_rsi(axes[2], indicators, x_indicators)
         
         # 4. MACD指标
-        self._plot_macd(axes[3], indicators)
+        self._plot_macd(axes[3], indicators, x_indicators)
         
         # 调整布局
-        plt.tight_layout()
+        fig.tight_layout()
         
         # 保存或显示
+        self._finish_figure(fig, save_path, '图表')
+            
+    def _get_figure(self, nrows: int = 1, height_ratios: Optional[Tuple[int, ...]] = None,
+                    figsize: Optional[Tuple[int, int]] = None):
+        """
+        获取指定布局的图表，已创建过的布局直接复用并清空各子图
+        
+        Args:
+            nrows: 子图行数
+            height_ratios: 各行高度比例 (可选)
+            figsize: 图表大小，默认使用 self.figsize
+            
+        Returns:
+            tuple: (Figure, 子图或子图列表)
+        """
+        figsize = tuple(figsize or self.figsize)
+        key = (nrows, 1, tuple(height_ratios) if height_ratios else None, figsize)
+        
+        fig = self._fig_cache.get(key)
+        # 窗口被用户关闭后图表已失效，需要重新创建
+        if fig is not None and plt.fignum_exists(fig.number):
+            for ax in fig.axes:
+                ax.clear()
+            plt.figure(fig.number)
+            return fig, (fig.axes if nrows > 1 else fig.axes[0])
+        
+        gridspec_kw = {'height_ratios': list(height_ratios)} if height_ratios else None
+        fig, axes = plt.subplots(nrows, 1, figsize=figsize, gridspec_kw=gridspec_kw)
+        self._fig_cache[key] = fig
+        return fig, axes
+        
+    def _finish_figure(self, fig: Figure, save_path: Optional[str], name: str) -> None:
+        """按配置保存图表；未指定路径时显示 (批量模式下只刷新画布)"""
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"📊 图表已保存到: {save_path}")
+            if self.tight_bbox:
+                fig.savefig(save_path, dpi=self.save_dpi, bbox_inches='tight')
+            else:
+                fig.savefig(save_path, dpi=self.save_dpi)
+            print(f"📊 {name}已保存到: {save_path}")
+        elif self.batch_mode:
+            fig.canvas.draw_idle()
         else:
             plt.show()
             
-    def _plot_candlestick(self, ax, data: pd.DataFrame, indicators: Dict[str, Any], symbol: str) -> None:
-        """绘制K线图和均线"""
-        # 准备数据
-        dates = data.index
-        opens = data['Open']
-        highs = data['High']
-        lows = data['Low']
-        closes = data['Close']
-        
-        # 绘制K线
-        for i in range(len(data)):
-            date = dates[i]
-            open_price = opens.iloc[i]
-            high_price = highs.iloc[i]
-            low_price = lows.iloc[i]
-            close_price = closes.iloc[i]
-            
-            # 确定颜色
-            color = self.colors['up'] if close_price >= open_price else self.colors['down']
-            
-            # 绘制影线
-            ax.plot([date, date], [low_price, high_price], color=color, linewidth=1)
-            
-            # 绘制实体
-            body_height = abs(close_price - open_price)
-            body_bottom = min(open_price, close_price)
-            
-            if close_price >= open_price:
-                # 阳线 (空心)
-                ax.add_patch(plt.Rectangle((date - timedelta(hours=8), body_bottom), 
-                                         timedelta(hours=16), body_height, 
-                                         facecolor='none', edgecolor=color, linewidth=1.5))
-            else:
-                # 阴线 (实心)
-                ax.add_patch(plt.Rectangle((date - timedelta(hours=8), body_bottom), 
-                                         timedelta(hours=16), body_height, 
-                                         facecolor=color, edgecolor=color, linewidth=1.5))
-        
-        # 绘制均线
-        if 'SMA_5' in indicators.columns:
-            ax.plot(dates, indicators['SMA_5'], label='SMA(5)', color='#ff6b6b', linewidth=1)
-        if 'SMA_20' in indicators.columns:
-            ax.plot(dates, indicators['SMA_20'], label='SMA(20)', color='#4ecdc4', linewidth=1.5)
-        if 'SMA_50' in indicators.columns:
-            ax.plot(dates, indicators['SMA_50'], label='SMA(50)', color='#45b7d1', linewidth=2)
+    def close(self) -> None:
+        """关闭所有缓存的图表"""
+        for fig in self._fig_cache.values():
+            plt.close(fig)
+        self._fig_cache.clear()
+        
+    def _plot_candlestick(self, ax, data: pd.DataFrame, indicators: Dict[str, Any], symbol: str,
+                          x: Optional[np.ndarray] = None) -> None:
+        """绘制K线图和均线 (x为预先转换的日期坐标，未提供时按数据索引计算)"""
+        # 准备数据 (一次性转为数组，整批构建图元)
+        if x is None:
+            x = mdates.date2num(data.index.to_pydatetime())
+        opens, highs, lows, closes = data[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64).T
+        up = closes >= opens
+        colors = np.where(up, self.colors['up'], self.colors['down'])
+        
+        # 绘制影线 (单个LineCollection)
+        ax.vlines(x, lows, highs, colors=colors, linewidth=1, rasterized=True)
+        
+        # 绘制实体 (单个PolyCollection)：阳线空心，阴线实心
+        half_width = BAR_WIDTH / 2
+        bottoms = np.minimum(opens, closes)
+        tops = np.maximum(opens, closes)
+        left, right = x - half_width, x + half_width
+        verts = np.stack([np.column_stack([left, bottoms]), np.column_stack([left, tops]),
+                          np.column_stack([right, tops]), np.column_stack([right, bottoms])], axis=1)
+        bodies = PolyCollection(verts, facecolors=np.where(up, 'none', colors),
+                                edgecolors=colors, linewidths=1.5, rasterized=True)
+        ax.add_collection(bodies)
+        ax.autoscale_view()
+        
+        # 绘制均线 (复用已转换的日期坐标，指标列直接取数组)
+        for column, label, color, width in (('SMA_5', 'SMA(5)', '#ff6b6b', 1),
+                                            ('SMA_20', 'SMA(20)', '#4ecdc4', 1.5),
+                                            ('SMA_50', 'SMA(50)', '#45b7d1', 2)):
+            if column in indicators.columns:
+                ax.plot(x, indicators[column].to_numpy(dtype=np.float64),
+                        label=label, color=color, linewidth=width)
         
         # 绘制布林带
         if all(col in indicators.columns for col in ['BB_upper', 'BB_lower', 'BB_middle']):
-            ax.plot(dates, indicators['BB_upper'], color='#ffa726', alpha=0.7, linewidth=1, label='布林带上轨')
-            ax.plot(dates, indicators['BB_lower'], color='#ffa726', alpha=0.7, linewidth=1, label='布林带下轨')
-            ax.fill_between(dates, indicators['BB_upper'], indicators['BB_lower'], 
-                           alpha=0.1, color='#ffa726')
+            bb_upper = indicators['BB_upper'].to_numpy(dtype=np.float64)
+            bb_lower = indicators['BB_lower'].to_numpy(dtype=np.float64)
+            ax.plot(x, bb_upper, color='#ffa726', alpha=0.7, linewidth=1, label='布林带上轨')
+            ax.plot(x, bb_lower, color='#ffa726', alpha=0.7, linewidth=1, label='布林带下轨')
+            ax.fill_between(x, bb_upper, bb_lower, alpha=0.1, color='#ffa726')
         
         ax.set_title(f'{symbol} K线图', fontsize=14, fontweight='bold')
         ax.set_ylabel('价格 (USDT)', fontsize=12)
@@ -138,14 +191,17 @@ class CryptoVisualizer:
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
         ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(data)//10)))
         
-    def _plot_volume(self, ax, data: pd.DataFrame) -> None:
+    def _plot_volume(self, ax, data: pd.DataFrame, x: Optional[np.ndarray] = None) -> None:
         """绘制成交量"""
-        dates = data.index
-        volumes = data['Volume']
-        colors = [self.colors['up'] if data['Close'].iloc[i] >= data['Open'].iloc[i] 
-                 else self.colors['down'] for i in range(len(data))]
-        
-        ax.bar(dates, volumes, color=colors, alpha=0.7, width=timedelta(hours=16))
+        if x is None:
+            x = mdates.date2num(data.index.to_pydatetime())
+        volumes = data['Volume'].to_numpy(dtype=np.float64)
+        up = data['Close'].to_numpy() >= data['Open'].to_numpy()
+        colors = np.where(up, self.colors['up'], self.colors['down'])
+        
+        ax.xaxis_date()
+        ax.bar(x, volumes, color=colors.tolist(), alpha=0.7, width=BAR_WIDTH,
+               rasterized=True)
         ax.set_title('成交量', fontsize=12, fontweight='bold')
         ax.set_ylabel('成交量', fontsize=10)
         ax.grid(True, alpha=0.3, color=self.colors['grid'])
@@ -153,23 +209,25 @@ class CryptoVisualizer:
         # 格式化y轴
         ax.ticklabel_format(style='scientific', axis='y', scilimits=(0,0))
         
-    def _plot_rsi(self, ax, indicators: Dict[str, Any]) -> None:
+    def _plot_rsi(self, ax, indicators: Dict[str, Any], x: Optional[np.ndarray] = None) -> None:
         """绘制RSI指标"""
         if 'RSI_14' not in indicators.columns:
             ax.text(0.5, 0.5, 'RSI数据不可用', ha='center', va='center', transform=ax.transAxes)
             return
             
-        dates = indicators.index
-        rsi = indicators['RSI_14']
+        if x is None:
+            x = mdates.date2num(indicators.index.to_pydatetime())
+        rsi = indicators['RSI_14'].to_numpy(dtype=np.float64)
         
-        ax.plot(dates, rsi, color='#9c27b0', linewidth=2, label='RSI(14)')
+        ax.xaxis_date()
+        ax.plot(x, rsi, color='#9c27b0', linewidth=2, label='RSI(14)')
         ax.axhline(y=70, color='red', linestyle='--', alpha=0.7, label='超买线(70)')
         ax.axhline(y=30, color='green', linestyle='--', alpha=0.7, label='超卖线(30)')
         ax.axhline(y=50, color='gray', linestyle='-', alpha=0.5)
         
         # 填充超买超卖区域
-        ax.fill_between(dates, 70, 100, alpha=0.1, color='red')
-        ax.fill_between(dates, 0, 30, alpha=0.1, color='green')
+        ax.fill_between(x, 70, 100, alpha=0.1, color='red')
+        ax.fill_between(x, 0, 30, alpha=0.1, color='green')
         
         ax.set_title('RSI 相对强弱指标', fontsize=12, fontweight='bold')
         ax.set_ylabel('RSI', fontsize=10)
@@ -177,25 +235,25 @@ class CryptoVisualizer:
         ax.legend(loc='upper right')
         ax.grid(True, alpha=0.3, color=self.colors['grid'])
         
-    def _plot_macd(self, ax, indicators: Dict[str, Any]) -> None:
+    def _plot_macd(self, ax, indicators: Dict[str, Any], x: Optional[np.ndarray] = None) -> None:
         """绘制MACD指标"""
         required_cols = ['MACD', 'MACD_signal', 'MACD_histogram']
         if not all(col in indicators.columns for col in required_cols):
             ax.text(0.5, 0.5, 'MACD数据不可用', ha='center', va='center', transform=ax.transAxes)
             return
             
-        dates = indicators.index
-        macd = indicators['MACD']
-        signal = indicators['MACD_signal']
-        histogram = indicators['MACD_histogram']
+        if x is None:
+            x = mdates.date2num(indicators.index.to_pydatetime())
+        macd, signal, histogram = indicators[required_cols].to_numpy(dtype=np.float64).T
         
         # 绘制MACD线和信号线
-        ax.plot(dates, macd, color='#2196f3', linewidth=2, label='MACD')
-        ax.plot(dates, signal, color='#ff9800', linewidth=2, label='Signal')
+        ax.plot(x, macd, color='#2196f3', linewidth=2, label='MACD')
+        ax.plot(x, signal, color='#ff9800', linewidth=2, label='Signal')
         
         # 绘制柱状图
-        colors = ['green' if h >= 0 else 'red' for h in histogram]
-        ax.bar(dates, histogram, color=colors, alpha=0.6, width=timedelta(hours=16), label='Histogram')
+        colors = np.where(histogram >= 0, 'green', 'red')
+        ax.bar(x, histogram, color=colors.tolist(), alpha=0.6,
+               width=BAR_WIDTH, label='Histogram', rasterized=True)
         
         ax.axhline(y=0, color='black', linestyle='-', alpha=0.5)
         ax.set_title('MACD 指标', fontsize=12, fontweight='bold')
@@ -218,8 +276,7 @@ class CryptoVisualizer:
             symbols: 币种符号列表
             save_path: 保存路径 (可选)
         """
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=self.figsize, 
-                                      gridspec_kw={'height_ratios': [3, 1]})
+        fig, (ax1, ax2) = self._get_figure(2, height_ratios=(3, 1))
         
         colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57']
         
@@ -251,13 +308,9 @@ class CryptoVisualizer:
         ax2.grid(True, alpha=0.3)
         ax2.ticklabel_format(style='scientific', axis='y', scilimits=(0,0))
         
-        plt.tight_layout()
+        fig.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"📊 对比图表已保存到: {save_path}")
-        else:
-            plt.show()
+        self._finish_figure(fig, save_path, '对比图表')
             
     def plot_correlation_heatmap(self, data_dict: Dict[str, pd.DataFrame], 
                                symbols: list, save_path: Optional[str] = None) -> None:
@@ -279,24 +332,57 @@ class CryptoVisualizer:
             print("❌ 需要至少2个币种的数据才能计算相关性")
             return
             
-        # 创建DataFrame并计算相关性
-        df = pd.DataFrame(price_data)
-        correlation_matrix = df.corr()
+        correlation_matrix = self._returns_correlation(price_data)
+        names = list(correlation_matrix.columns)
+        values = correlation_matrix.to_numpy()
+        
+        # 绘制热力图 (imshow + 文本标注，代替逐格绘制的seaborn热力图)
+        # 颜色条会额外添加子图，复用时整张图清空重建
+        fig, _ = self._get_figure(figsize=(10, 8))
+        fig.clf()
+        ax = fig.add_subplot()
+        image = ax.imshow(values, cmap='RdYlBu_r', vmin=-1, vmax=1)
+        fig.colorbar(image, ax=ax, shrink=.8)
+        
+        for (i, j), value in np.ndenumerate(values):
+            ax.text(j, i, f'{value:.2f}', ha='center', va='center',
+                    color='white' if abs(value) > 0.6 else 'black')
+        
+        ax.set_xticks(range(len(names)))
+        ax.set_xticklabels(names, rotation=90)
+        ax.set_yticks(range(len(names)))
+        ax.set_yticklabels(names)
+        ax.set_title('加密货币收益率相关性热力图', fontsize=16, fontweight='bold', pad=20)
+        fig.tight_layout()
+        
+        self._finish_figure(fig, save_path, '相关性热力图')
+            
+    def _returns_correlation(self, price_data: Dict[str, pd.Series]) -> pd.DataFrame:
+        """
+        计算对数收益率相关矩阵，相同币种且数据未更新时直接返回缓存结果
         
-        # 绘制热力图
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(correlation_matrix, annot=True, cmap='RdYlBu_r', center=0,
-                   square=True, linewidths=0.5, cbar_kws={"shrink": .8})
+        Args:
+            price_data: 币种 -> 收盘价序列
+            
+        Returns:
+            pd.DataFrame: 相关系数矩阵
+        """
+        # 以最后时间戳和数据长度识别数据是否变化
+        key = tuple((symbol, series.index[-1].value, len(series))
+                    for symbol, series in price_data.items())
+        matrix = self._corr_cache.get(key)
+        if matrix is not None:
+            return matrix
         
-        plt.title('加密货币价格相关性热力图', fontsize=16, fontweight='bold', pad=20)
-        plt.tight_layout()
+        df = pd.DataFrame(price_data)
+        returns = np.log(df / df.shift(1)).dropna()
+        matrix = returns.corr()
+        
+        if len(self._corr_cache) >= CORRELATION_CACHE_SIZE:
+            self._corr_cache.pop(next(iter(self._corr_cache)))
+        self._corr_cache[key] = matrix
+        return matrix
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"📊 相关性热力图已保存到: {save_path}")
-        else:
-            plt.show()
-            
     def plot_trading_signals(self, data: pd.DataFrame, signals: Dict[str, Any], 
                            symbol: str, save_path: Optional[str] = None) -> None:
         """
@@ -308,7 +394,7 @@ class CryptoVisualizer:
             symbol: 加密货币符号
             save_path: 保存路径 (可选)
         """
-        fig, ax = plt.subplots(figsize=(15, 8))
+        fig, ax = self._get_figure(figsize=(15, 8))
         
         # 绘制价格线
         ax.plot(data.index, data['Close'], color='#2196f3', linewidth=2, label='收盘价')
@@ -336,13 +422,9 @@ class CryptoVisualizer:
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
         ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(data)//15)))
         
-        plt.tight_layout()
+        fig.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"📊 交易信号图已保存到: {save_path}")
-        else:
-            plt.show()
+        self._finish_figure(fig, save_path, '交易信号图')
 
 
 def create_charts_directory() -> str:
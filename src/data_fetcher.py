@@ -5,32 +5,214 @@
 
 import yfinance as yf
 import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import time
 import random
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple, Callable
 import warnings
 warnings.filterwarnings('ignore')
 
+from cache import FileCache, get_default_cache, is_intraday
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    # 未安装aiohttp时，批量获取使用 yf.download 分组下载
+    AIOHTTP_AVAILABLE = False
+
+
+def _in_event_loop() -> bool:
+    """当前线程是否已有运行中的事件循环 (如Jupyter或协程中调用同步接口，此时不能使用 asyncio.run)"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+# 股票基本信息缓存有效期(秒)：公司名称、行业等信息变化很慢
+STOCK_INFO_TTL = 6 * 60 * 60
+
+# 批量下载时每次请求包含的股票数
+BATCH_DOWNLOAD_SIZE = 20
+
+# 重试退避: 基础延迟(秒)、延迟上限(秒)、抖动比例
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_JITTER = 0.5
+
+# 与单只获取 (ticker.history) 返回一致的列
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Yahoo 行情图表接口 (支持 range/interval 参数，返回单只股票的K线)
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+# 异步批量获取时同时在途的请求数 (Yahoo 按分钟限额，过高会触发429)
+YAHOO_MAX_CONCURRENCY = 6
+# Yahoo 批量报价接口 (一次请求返回多只股票的价格/成交量/52周区间/市值)
+YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+# 批量报价每次请求包含的股票数
+QUOTE_BATCH_SIZE = 20
+# 报价接口需要会话cookie与配套的crumb参数：先访问 fc.yahoo.com 取得cookie，再用cookie换取crumb
+YAHOO_COOKIE_URL = "https://fc.yahoo.com"
+YAHOO_CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+# HTTP连接池: 缓存的主机连接池数、每个主机保持的连接数 (不小于并发验证的线程数)
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+# Yahoo 会拒绝默认的 aiohttp User-Agent
+YAHOO_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'Accept': 'application/json',
+}
+
+# yfinance 时间周期单位 -> pandas DateOffset 参数
+PERIOD_UNITS = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+
+
+def period_start(end: pd.Timestamp, period: str) -> Optional[pd.Timestamp]:
+    """
+    计算以 end 结尾、长度为 period 的时间窗口起点
+    
+    Args:
+        end: 窗口终点
+        period: yfinance 时间周期 ('5d', '3mo', '1y', 'ytd', 'max' 等)
+        
+    Returns:
+        Timestamp: 窗口起点，'max' 或无法识别的周期返回None
+    """
+    if period == 'ytd':
+        return end.normalize().replace(month=1, day=1)
+    for suffix, unit in PERIOD_UNITS.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return end - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    return None
+
+
+def ttl_cache(seconds: float, maxsize: int = 256) -> Callable:
+    """
+    带有效期的LRU缓存装饰器 (线程安全，异常不缓存)
+    
+    每个条目从写入时起计算有效期，超过 maxsize 时淘汰最久未使用的条目
+    
+    Args:
+        seconds: 条目有效期(秒)
+        maxsize: 最大条目数
+        
+    Returns:
+        Callable: 装饰器 (被装饰函数的参数需可哈希)
+    """
+    def decorator(func: Callable) -> Callable:
+        entries: OrderedDict = OrderedDict()
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(args)
+                if entry is not None and entry[0] > now:
+                    entries.move_to_end(args)
+                    return entry[1]
+            
+            value = func(*args)
+            with lock:
+                entries[args] = (now + seconds, value)
+                entries.move_to_end(args)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return value
+        
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+@ttl_cache(STOCK_INFO_TTL, maxsize=256)
+def _cached_ticker_info(symbol: str) -> Mapping[str, Any]:
+    """
+    获取并缓存 yfinance 的原始 ticker.info
+    
+    Args:
+        symbol: 股票代码
+        
+    Returns:
+        Mapping: 只读的原始信息字典 (调用方无法修改缓存内容)
+    """
+    return MappingProxyType(dict(yf.Ticker(symbol).info))
+
+
+def get_ticker_info(symbol: str) -> Mapping[str, Any]:
+    """
+    获取股票原始信息，同一会话内在有效期内只请求一次
+    
+    Args:
+        symbol: 股票代码
+        
+    Returns:
+        Mapping: 只读的原始信息字典
+    """
+    return _cached_ticker_info(symbol.upper())
+
 
 class StockDataFetcher:
     """股票数据获取器"""
     
-    def __init__(self, retry_count: int = 5, retry_delay: float = 3.0):
+    # 进程内共享的限流冷却截止时间 (time.monotonic)：任一请求遇到429后，
+    # 所有获取器在此之前都不再发出请求，避免每只股票各自撞一次限流
+    _rate_limit_until: float = 0.0
+    _rate_limit_lock = threading.Lock()
+    
+    def __init__(self, retry_count: int = 5, retry_delay: float = RETRY_BASE_DELAY,
+                 cache: Optional[FileCache] = None, use_cache: bool = True,
+                 max_delay: float = RETRY_MAX_DELAY, jitter: float = RETRY_JITTER):
         """
         初始化数据获取器
         
         Args:
             retry_count: 重试次数 (默认5次)
-            retry_delay: 基础重试延迟(秒，默认3秒)
+            retry_delay: 基础重试延迟(秒，默认1秒)
+            cache: 磁盘缓存 (默认使用共享的 ~/.cache/stock-analyzer)
+            use_cache: 是否启用磁盘缓存
+            max_delay: 单次重试延迟上限(秒，默认30秒)
+            jitter: 随机抖动比例，实际延迟为 [1, 1 + jitter] 倍
         """
         self.retry_count = retry_count
         self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.cache = (cache if cache is not None else get_default_cache()) if use_cache else None
+        self.chart_url = YAHOO_CHART_URL
+        self.quote_url = YAHOO_QUOTE_URL
+        # 报价接口的crumb (每个会话获取一次)；被拒绝后本会话不再使用报价接口
+        self._quote_crumb: Optional[str] = None
+        self._quotes_disabled = False
+        # 所有直接请求共用一个带连接池的会话，TCP/TLS握手只在首次连接时发生
+        # (重试由 _backoff_delay 统一处理，适配器不再自行重试)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                              pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(YAHOO_HEADERS)
     
     def get_stock_data(self, symbol: str, period: str = "1y", 
                       interval: str = "1d") -> Optional[pd.DataFrame]:
         """
-        获取股票数据
+        获取股票数据 (优先读取磁盘缓存；日线及以上缓存过期时只补取最新K线)
         
         Args:
             symbol: 股票代码 (如 'AAPL', 'TSLA')
@@ -40,18 +222,120 @@ class StockDataFetcher:
         Returns:
             DataFrame: 包含OHLCV数据的DataFrame，失败返回None
         """
+        if self.cache is None:
+            return self._download_history(symbol, interval, period=period)
+        
+        data = self.cache.get(symbol, period, interval)
+        if data is not None:
+            print(f"💾 使用缓存数据: {symbol} ({len(data)} 条)")
+            return data
+        
+        if not is_intraday(interval):
+            stale = self.cache.get(symbol, period, interval, allow_stale=True)
+            if stale is not None and not stale.empty:
+                data = self._refresh_tail(symbol, period, interval, stale)
+        
+        if data is None:
+            data = self._download_history(symbol, interval, period=period)
+        
+        if data is not None:
+            self.cache.set(symbol, period, interval, data)
+        return data
+    
+    def _refresh_tail(self, symbol: str, period: str, interval: str,
+                      stale: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        在过期缓存的基础上只获取最后一根K线之后的数据并拼接
+        
+        Args:
+            symbol: 股票代码
+            period: 时间周期 (拼接后按该周期截取窗口)
+            interval: 数据间隔
+            stale: 过期的缓存数据
+            
+        Returns:
+            DataFrame: 更新后的数据；复权价格已变化或获取失败时返回None (需完整重新获取)
+        """
+        last = stale.index[-1]
+        print(f"🔁 增量更新 {symbol}: 获取 {last.strftime('%Y-%m-%d')} 之后的数据...")
+        tail = self._download_history(symbol, interval, start=last.strftime('%Y-%m-%d'))
+        if tail is None:
+            return None
+        
+        # 新数据的首根K线应与缓存重叠；收盘价不一致说明发生了分红/拆股复权
+        first = tail.index[0]
+        if first not in stale.index or not np.isclose(stale.at[first, 'Close'], tail.at[first, 'Close']):
+            print(f"⚠️ {symbol} 复权价格已变化，重新获取完整数据")
+            return None
+        
+        data = pd.concat([stale[stale.index < first], tail])
+        start = period_start(data.index[-1], period)
+        return data[data.index >= start] if start is not None else data
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        计算第 attempt 次失败后的等待时间 (带上限的指数退避 + 随机抖动)
+        
+        Args:
+            attempt: 已失败的尝试序号 (从0开始)
+            
+        Returns:
+            float: 等待秒数
+        """
+        delay = min(self.max_delay, self.retry_delay * (2 ** attempt))
+        return delay * (1 + random.uniform(0, self.jitter))
+    
+    @classmethod
+    def _cooldown_remaining(cls) -> float:
+        """返回共享限流冷却的剩余秒数"""
+        return cls._rate_limit_until - time.monotonic()
+    
+    @classmethod
+    def _start_cooldown(cls, seconds: float) -> None:
+        """
+        遇到限流时延长共享冷却截止时间 (只会推后，不会提前)
+        
+        Args:
+            seconds: 冷却时长(秒)
+        """
+        with cls._rate_limit_lock:
+            cls._rate_limit_until = max(cls._rate_limit_until, time.monotonic() + seconds)
+    
+    @staticmethod
+    def _is_rate_limited(error: Exception) -> bool:
+        """判断异常是否为请求频率限制 (HTTP 429)"""
+        if getattr(error, 'status', None) == 429:
+            return True
+        error_msg = str(error).lower()
+        return "too many requests" in error_msg or "429" in error_msg
+    
+    def _download_history(self, symbol: str, interval: str, **history_kwargs) -> Optional[pd.DataFrame]:
+        """
+        调用 ticker.history 获取数据，失败时按指数退避重试
+        
+        Args:
+            symbol: 股票代码
+            interval: 数据间隔
+            **history_kwargs: 时间范围参数 (period 或 start)
+            
+        Returns:
+            DataFrame: 包含OHLCV数据的DataFrame，失败返回None
+        """
+        span = ', '.join(f"{'周期' if key == 'period' else '起始'}: {value}"
+                         for key, value in history_kwargs.items())
         for attempt in range(self.retry_count):
             try:
-                print(f"📊 获取 {symbol} 数据 (周期: {period}, 间隔: {interval}) - 第 {attempt + 1} 次尝试...")
+                # 其他请求触发了限流时，等待共享冷却结束后再发出请求
+                wait = self._cooldown_remaining()
+                if wait > 0:
+                    print(f"🚫 请求频率受限，等待 {wait:.1f} 秒...")
+                    time.sleep(wait)
                 
-                # 添加随机延迟避免请求过于频繁
-                if attempt > 0:
-                    random_delay = random.uniform(0.5, 2.0)
-                    time.sleep(random_delay)
+                print(f"📊 获取 {symbol} 数据 ({span}, 间隔: {interval}) - 第 {attempt + 1} 次尝试...")
                 
                 ticker = yf.Ticker(symbol)
-                data = ticker.history(period=period, interval=interval, auto_adjust=True, 
-                                    prepost=False, actions=False)
+                data = ticker.history(interval=interval, auto_adjust=True,
+                                      prepost=False, actions=False, **history_kwargs)
                 
                 if not data.empty:
                     print(f"✅ 成功获取 {len(data)} 条数据")
@@ -60,17 +344,16 @@ class StockDataFetcher:
                     print(f"⚠️ 获取到空数据，可能股票代码无效")
                     
             except Exception as e:
-                error_msg = str(e).lower()
                 print(f"❌ 第 {attempt + 1} 次尝试失败: {e}")
                 
                 if attempt < self.retry_count - 1:
-                    # 指数退避策略：每次重试延迟时间递增
-                    delay = self.retry_delay * (2 ** attempt) + random.uniform(1, 3)
+                    # 指数退避策略：每次重试延迟时间递增，且不超过 max_delay
+                    delay = self._backoff_delay(attempt)
                     
-                    # 如果是"Too Many Requests"错误，延迟更长时间
-                    if "too many requests" in error_msg or "429" in error_msg:
-                        delay = max(delay, 10 + random.uniform(5, 15))
-                        print(f"🚫 检测到请求频率限制，延长等待时间...")
+                    # 限流是全局的：设置共享冷却，其他股票的请求也一并等待
+                    if self._is_rate_limited(e):
+                        self._start_cooldown(delay)
+                        print(f"🚫 检测到请求频率限制，暂停所有请求 {delay:.1f} 秒...")
                     
                     print(f"⏳ {delay:.1f} 秒后重试...")
                     time.sleep(delay)
@@ -89,8 +372,7 @@ class StockDataFetcher:
             Dict: 股票基本信息
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = get_ticker_info(symbol)
             
             # 提取关键信息
             key_info = {
@@ -117,41 +399,277 @@ class StockDataFetcher:
             print(f"❌ 获取 {symbol} 基本信息失败: {e}")
             return {'symbol': symbol, 'error': str(e)}
     
-    def get_multiple_stocks(self, symbols: list, period: str = "1y") -> Dict[str, pd.DataFrame]:
+    def _get_quote_crumb(self) -> Optional[str]:
+        """
+        获取报价接口的crumb (每个会话只获取一次)
+        
+        Returns:
+            str: crumb，获取失败时返回None并在本会话内停用报价接口
+        """
+        if self._quotes_disabled:
+            return None
+        if self._quote_crumb is None:
+            try:
+                # fc.yahoo.com 通常返回404，但会在会话中设置所需cookie
+                self.session.get(YAHOO_COOKIE_URL, timeout=10)
+                response = self.session.get(YAHOO_CRUMB_URL, timeout=10)
+                response.raise_for_status()
+                crumb = response.text.strip()
+                if not crumb or '<' in crumb:
+                    raise ValueError("响应中没有有效的crumb")
+                self._quote_crumb = crumb
+            except Exception as e:
+                self._disable_quotes(e)
+        return self._quote_crumb
+    
+    def _disable_quotes(self, reason: Any) -> None:
+        """本会话内停用报价接口 (只提示一次)，之后直接逐只获取"""
+        if not self._quotes_disabled:
+            self._quotes_disabled = True
+            print(f"⚠️ 批量报价接口不可用，改为逐只获取: {reason}")
+    
+    def _fetch_quotes(self, symbols: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        通过批量报价接口获取报价，每 QUOTE_BATCH_SIZE 只股票合并为一次请求
+        
+        Args:
+            symbols: 股票代码列表
+            
+        Returns:
+            tuple: (股票代码 -> 报价数据, 未能通过报价接口查询的股票代码)
+        """
+        quotes, failed = {}, []
+        for start in range(0, len(symbols), QUOTE_BATCH_SIZE):
+            chunk = symbols[start:start + QUOTE_BATCH_SIZE]
+            crumb = self._get_quote_crumb()
+            if crumb is None:
+                failed.extend(chunk)
+                continue
+            
+            wait = self._cooldown_remaining()
+            if wait > 0:
+                print(f"🚫 请求频率受限，等待 {wait:.1f} 秒...")
+                time.sleep(wait)
+            
+            try:
+                response = self.session.get(self.quote_url, timeout=30,
+                                            params={'symbols': ','.join(chunk), 'crumb': crumb})
+                if response.status_code in (401, 403):
+                    self._disable_quotes(f"HTTP {response.status_code}")
+                    failed.extend(chunk)
+                    continue
+                if response.status_code == 429:
+                    self._start_cooldown(self._backoff_delay(0))
+                response.raise_for_status()
+                results = response.json()['quoteResponse']['result']
+            except Exception as e:
+                print(f"⚠️ 批量报价请求失败，改为逐只获取: {e}")
+                failed.extend(chunk)
+                continue
+            
+            for quote in results:
+                if quote.get('symbol') in chunk:
+                    quotes[quote['symbol']] = quote
+        return quotes, failed
+    
+    def download_batch(self, symbols: List[str], period: str = "1y",
+                       interval: str = "1d") -> Dict[str, pd.DataFrame]:
         """
-        批量获取多只股票数据
+        用一次 yf.download 请求获取一组股票数据
         
         Args:
             symbols: 股票代码列表
             period: 时间周期
+            interval: 数据间隔
             
         Returns:
-            Dict: 股票代码为键，DataFrame为值的字典
+            Dict: 成功的股票代码为键，DataFrame为值 (批量响应中缺失或为空的股票不包含在内)
         """
+        try:
+            raw = yf.download(" ".join(symbols), period=period, interval=interval,
+                              group_by='ticker', threads=True, progress=False,
+                              auto_adjust=True, actions=False, ignore_tz=False,
+                              multi_level_index=True)
+        except Exception as e:
+            print(f"❌ 批量下载失败: {e}")
+            return {}
+        
+        if raw is None or raw.empty:
+            return {}
+        
         results = {}
+        tickers = set(raw.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in tickers:
+                continue
+            # 不同交易所的交易日不同，对齐后补出的空行需要去掉
+            data = raw[symbol][OHLCV_COLUMNS].dropna(how='all')
+            if not data.empty:
+                data.columns.name = None
+                results[symbol] = data
+        return results
+    
+    def get_multiple_stocks(self, symbols: list, period: str = "1y",
+                            interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """
+        批量获取多只股票数据：缓存命中的直接读取，其余每 BATCH_DOWNLOAD_SIZE 只
+        合并为一次请求，批量响应中缺失的股票再逐只重试
+        
+        Args:
+            symbols: 股票代码列表
+            period: 时间周期
+            interval: 数据间隔
+            
+        Returns:
+            Dict: 股票代码为键，DataFrame为值的字典 (仅包含成功的股票，保持输入顺序)
+        """
+        frames = {}
         total_symbols = len(symbols)
         
         print(f"🔄 开始批量获取 {total_symbols} 只股票数据...")
         
-        for i, symbol in enumerate(symbols, 1):
-            print(f"\n📈 处理第 {i}/{total_symbols} 只股票: {symbol}")
-            
-            data = self.get_stock_data(symbol, period)
+        if self.cache is not None:
+            for symbol in symbols:
+                data = self.cache.get(symbol, period, interval)
+                if data is not None:
+                    print(f"💾 使用缓存数据: {symbol} ({len(data)} 条)")
+                    frames[symbol] = data
+        
+        pending = [symbol for symbol in symbols if symbol not in frames]
+        if pending and AIOHTTP_AVAILABLE and not _in_event_loop():
+            # 并发请求图表接口，同时在途的请求数受信号量限制；
+            # 已在事件循环中调用时无法 asyncio.run，走下方分组下载
+            downloaded = asyncio.run(self.get_multiple_stocks_async(pending, period, interval))
+        else:
+            downloaded = {}
+            for start in range(0, len(pending), BATCH_DOWNLOAD_SIZE):
+                chunk = pending[start:start + BATCH_DOWNLOAD_SIZE]
+                print(f"📦 批量下载第 {start + 1}-{start + len(chunk)} 只股票...")
+                downloaded.update(self.download_batch(chunk, period, interval))
+        
+        if self.cache is not None:
+            for symbol, data in downloaded.items():
+                self.cache.set(symbol, period, interval, data)
+        frames.update(downloaded)
+        
+        # 批量响应中缺失的股票走单只获取 (带重试)
+        missing = [symbol for symbol in symbols if symbol not in frames]
+        for symbol in missing:
+            print(f"\n📈 单独获取: {symbol}")
+            data = self.get_stock_data(symbol, period, interval)
             if data is not None:
-                results[symbol] = data
-                print(f"✅ {symbol} 数据获取成功")
-            else:
-                print(f"❌ {symbol} 数据获取失败")
-            
-            # 批量请求时增加更长的延迟，避免API限制
-            if i < total_symbols:  # 不是最后一个
-                delay = random.uniform(2.0, 5.0)
-                print(f"⏳ 等待 {delay:.1f} 秒后处理下一只股票...")
-                time.sleep(delay)
+                frames[symbol] = data
         
+        results = {symbol: frames[symbol] for symbol in symbols if symbol in frames}
         print(f"\n🎯 批量获取完成: 成功 {len(results)}/{total_symbols} 只股票")
         return results
     
+    async def get_multiple_stocks_async(self, symbols: List[str], period: str = "1y",
+                                        interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """
+        异步并发获取多只股票数据 (直接请求 Yahoo 图表接口，不经过缓存)
+        
+        Args:
+            symbols: 股票代码列表
+            period: 时间周期
+            interval: 数据间隔
+            
+        Returns:
+            Dict: 成功的股票代码为键，DataFrame为值 (保持输入顺序，失败的股票不包含在内)
+        """
+        semaphore = asyncio.Semaphore(YAHOO_MAX_CONCURRENCY)
+        
+        async def bounded(symbol: str, session: 'aiohttp.ClientSession') -> Optional[pd.DataFrame]:
+            async with semaphore:
+                return await self._fetch_one(session, symbol, period, interval)
+        
+        print(f"⚡ 并发获取 {len(symbols)} 只股票数据 (最多 {YAHOO_MAX_CONCURRENCY} 个并发请求)...")
+        async with aiohttp.ClientSession(headers=YAHOO_HEADERS,
+                                         timeout=aiohttp.ClientTimeout(total=30)) as session:
+            frames = await asyncio.gather(*(bounded(symbol, session) for symbol in symbols))
+        
+        return {symbol: data for symbol, data in zip(symbols, frames) if data is not None}
+    
+    async def _fetch_one(self, session: 'aiohttp.ClientSession', symbol: str,
+                         period: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        异步获取单只股票的K线，频率限制和服务器错误时按指数退避重试
+        
+        Args:
+            session: aiohttp会话
+            symbol: 股票代码
+            period: 时间周期
+            interval: 数据间隔
+            
+        Returns:
+            DataFrame: 包含OHLCV数据的DataFrame，失败返回None
+        """
+        params = {'range': period, 'interval': interval,
+                  'includePrePost': 'false', 'events': 'div,split'}
+        for attempt in range(self.retry_count):
+            try:
+                wait = self._cooldown_remaining()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                async with session.get(self.chart_url.format(symbol=symbol), params=params) as response:
+                    if response.status == 429 or response.status >= 500:
+                        raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                          status=response.status)
+                    if response.status >= 400:
+                        # 代码无效等错误重试无意义
+                        return None
+                    payload = await response.json(content_type=None)
+                return self._chart_to_ohlcv(payload, interval)
+            except Exception as e:
+                print(f"❌ {symbol} 第 {attempt + 1} 次尝试失败: {e}")
+                if attempt < self.retry_count - 1:
+                    delay = self._backoff_delay(attempt)
+                    if self._is_rate_limited(e):
+                        self._start_cooldown(delay)
+                    await asyncio.sleep(delay)
+        return None
+    
+    @staticmethod
+    def _chart_to_ohlcv(payload: Dict[str, Any], interval: str) -> Optional[pd.DataFrame]:
+        """
+        将图表接口的响应转换为与 ticker.history(auto_adjust=True) 相同格式的DataFrame
+        
+        Args:
+            payload: 图表接口返回的JSON
+            interval: 数据间隔
+            
+        Returns:
+            DataFrame: 以交易所时区时间为索引的OHLCV数据，无数据返回None
+        """
+        results = (payload.get('chart') or {}).get('result') or []
+        if not results or not results[0].get('timestamp'):
+            return None
+        result = results[0]
+        
+        quote = result['indicators']['quote'][0]
+        columns = {column: np.array(quote.get(column.lower()) or [], dtype=np.float64)
+                   for column in OHLCV_COLUMNS}
+        
+        # 复权：按复权收盘价与收盘价之比调整开高低价 (日内数据没有复权价)
+        adjclose = result['indicators'].get('adjclose')
+        if adjclose:
+            adjusted = np.array(adjclose[0]['adjclose'], dtype=np.float64)
+            ratio = adjusted / columns['Close']
+            for column in ('Open', 'High', 'Low'):
+                columns[column] = columns[column] * ratio
+            columns['Close'] = adjusted
+        
+        index = pd.to_datetime(np.asarray(result['timestamp'], dtype=np.int64), unit='s', utc=True)
+        index = index.tz_convert(result['meta'].get('exchangeTimezoneName', 'UTC'))
+        if not is_intraday(interval):
+            # 与yfinance一致，日线及以上的K线时间取交易所当地零点
+            index = index.normalize()
+        index.name = 'Date'
+        
+        data = pd.DataFrame(columns, index=index).dropna(how='all')
+        data = data[~data.index.duplicated(keep='last')]
+        return data if not data.empty else None
+    
     def validate_symbol(self, symbol: str) -> bool:
         """
         验证股票代码是否有效
@@ -162,12 +680,43 @@ class StockDataFetcher:
         Returns:
             bool: 是否有效
         """
+        wait = self._cooldown_remaining()
+        if wait > 0:
+            print(f"🚫 请求频率受限，等待 {wait:.1f} 秒...")
+            time.sleep(wait)
+        
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = get_ticker_info(symbol)
             return 'symbol' in info or 'shortName' in info
         except:
             return False
+    
+    def validate_symbols(self, symbols: list) -> list:
+        """
+        批量验证多个股票代码，避免逐个串行请求
+        
+        Args:
+            symbols: 股票代码列表
+            
+        Returns:
+            list: 有效的股票代码 (保持输入顺序)
+        """
+        if not symbols:
+            return []
+        
+        # 批量报价中存在即为有效；只有请求失败的批次才逐只验证
+        quotes, failed = self._fetch_quotes(symbols)
+        valid = set(quotes)
+        if failed:
+            if self._cooldown_remaining() > 0:
+                # 批量报价被限流：冷却结束后逐只串行验证，避免并发请求再次触发限流
+                flags = [self.validate_symbol(symbol) for symbol in failed]
+            else:
+                with ThreadPoolExecutor(max_workers=min(len(failed), 16)) as executor:
+                    flags = list(executor.map(self.validate_symbol, failed))
+            valid.update(symbol for symbol, is_valid in zip(failed, flags) if is_valid)
+        
+        return [symbol for symbol in symbols if symbol in valid]
 
 
 # 常用股票代码
@@ -179,9 +728,10 @@ POPULAR_STOCKS = {
 }
 
 
-def get_popular_stocks() -> Dict[str, list]:
-    """获取常用股票代码分类"""
-    return POPULAR_STOCKS
+@functools.lru_cache(maxsize=1)
+def get_popular_stocks() -> Mapping[str, Tuple[str, ...]]:
+    """获取常用股票代码分类 (只读，首次调用后缓存)"""
+    return MappingProxyType({category: tuple(symbols) for category, symbols in POPULAR_STOCKS.items()})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,935 @@
+"""
+Numba加速的技术指标内核
+直接在连续的float64数组上计算指标，结果与ta库保持一致
+"""
+
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # 未安装numba时退化为普通Python函数，结果相同但速度较慢
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def sma(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    简单移动平均 (滑动窗口累加和)
+
+    Args:
+        x: 价格数组
+        period: 窗口长度
+
+    Returns:
+        ndarray: SMA，窗口未满或含NaN时为NaN
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    total = 0.0
+    nan_count = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            total += x[i]
+        if i >= period:
+            if np.isnan(x[i - period]):
+                nan_count -= 1
+            else:
+                total -= x[i - period]
+        if i >= period - 1 and nan_count == 0:
+            out[i] = total / period
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ewm(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """
+    指数加权平均 (等价于 pandas ewm(alpha=alpha, adjust=False).mean())
+
+    Args:
+        x: 输入数组，允许包含NaN
+        alpha: 平滑系数
+        min_periods: 输出有效值所需的最少观测数
+
+    Returns:
+        ndarray: 指数加权平均
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+
+    old_wt_factor = 1.0 - alpha
+    weighted = x[0]
+    nobs = 0 if np.isnan(weighted) else 1
+    old_wt = 1.0
+    if nobs >= min_periods:
+        out[0] = weighted
+
+    for i in range(1, n):
+        cur = x[i]
+        is_obs = not np.isnan(cur)
+        if is_obs:
+            nobs += 1
+        if not np.isnan(weighted):
+            # 递推: ema[i] = α·x[i] + (1-α)·ema[i-1]，缺失值处权重继续衰减
+            old_wt *= old_wt_factor
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        if nobs >= min_periods:
+            out[i] = weighted
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ema(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    指数移动平均
+
+    Args:
+        x: 价格数组
+        period: 周期
+
+    Returns:
+        ndarray: EMA
+    """
+    return ewm(x, 2.0 / (period + 1.0), period)
+
+
+@njit(cache=True, nogil=True)
+def rsi(x: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    相对强弱指标 (Wilder平滑)
+
+    Args:
+        x: 收盘价数组
+        period: 周期
+
+    Returns:
+        ndarray: RSI
+    """
+    n = len(x)
+    up = np.zeros(n)
+    down = np.zeros(n)
+    for i in range(1, n):
+        diff = x[i] - x[i - 1]
+        if diff > 0:
+            up[i] = diff
+        elif diff < 0:
+            down[i] = -diff
+
+    ema_up = ewm(up, 1.0 / period, period)
+    ema_down = ewm(down, 1.0 / period, period)
+
+    out = np.full(n, np.nan)
+    for i in range(n):
+        if ema_down[i] == 0:
+            out[i] = 100.0
+        elif not np.isnan(ema_down[i]):
+            out[i] = 100.0 - 100.0 / (1.0 + ema_up[i] / ema_down[i])
+    return out
+
+
+@njit(cache=True, nogil=True)
+def macd(x: np.ndarray, fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD指标
+
+    Args:
+        x: 收盘价数组
+        fast: 快线周期
+        slow: 慢线周期
+        signal: 信号线周期
+
+    Returns:
+        tuple: (MACD线, 信号线, 柱状图)
+    """
+    macd_line = ema(x, fast) - ema(x, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean_std(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    滑动窗口均值和总体标准差 (Welford增删递推，单次遍历)
+
+    Args:
+        x: 输入数组
+        period: 窗口长度
+
+    Returns:
+        tuple: (均值, 标准差ddof=0)
+    """
+    n = len(x)
+    mean_out = np.full(n, np.nan)
+    std_out = np.full(n, np.nan)
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    for i in range(n):
+        val = x[i]
+        if not np.isnan(val):
+            count += 1
+            delta = val - mean
+            mean += delta / count
+            m2 += delta * (val - mean)
+        if i >= period:
+            old = x[i - period]
+            if not np.isnan(old):
+                count -= 1
+                if count > 0:
+                    delta = old - mean
+                    mean -= delta / count
+                    m2 -= delta * (old - mean)
+                else:
+                    mean = 0.0
+                    m2 = 0.0
+        if i >= period - 1 and count == period:
+            mean_out[i] = mean
+            std_out[i] = np.sqrt(max(m2, 0.0) / count)
+    return mean_out, std_out
+
+
+@njit(cache=True, nogil=True)
+def bollinger(x: np.ndarray, period: int = 20,
+              window_dev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    布林带
+
+    Args:
+        x: 收盘价数组
+        period: 窗口长度
+        window_dev: 标准差倍数
+
+    Returns:
+        tuple: (上轨, 中轨, 下轨, %B, 带宽)
+    """
+    mavg, mstd = rolling_mean_std(x, period)
+    upper = mavg + window_dev * mstd
+    lower = mavg - window_dev * mstd
+
+    n = len(x)
+    pband = np.full(n, np.nan)
+    for i in range(n):
+        if upper[i] != lower[i]:
+            pband[i] = (x[i] - lower[i]) / (upper[i] - lower[i])
+    wband = (upper - lower) / mavg * 100.0
+    return upper, mavg, lower, pband, wband
+
+
+@njit(cache=True, nogil=True)
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    真实波幅
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+
+    Returns:
+        ndarray: 真实波幅
+    """
+    n = len(close)
+    out = np.empty(n)
+    for i in range(n):
+        tr = high[i] - low[i]
+        if i > 0 and not np.isnan(close[i - 1]):
+            # 与ta一致: 缺失项不参与取最大值
+            for gap in (abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])):
+                if np.isnan(tr) or gap > tr:
+                    tr = gap
+        out[i] = tr
+    return out
+
+
+@njit(cache=True, nogil=True)
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    平均真实波幅 (Wilder平滑，首值为前period个真实波幅的均值)
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        period: 周期
+
+    Returns:
+        ndarray: ATR，窗口未满处为0
+    """
+    n = len(close)
+    out = np.zeros(n)
+    if n < period:
+        return out
+    tr = true_range(high, low, close)
+    out[period - 1] = np.nanmean(tr[:period])
+    for i in range(period, n):
+        out[i] = (out[i - 1] * (period - 1) + tr[i]) / period
+    return out
+
+
+@njit(cache=True, nogil=True)
+def mfi(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+        volume: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    资金流量指数
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        volume: 成交量数组
+        period: 周期
+
+    Returns:
+        ndarray: MFI
+    """
+    n = len(close)
+    typical = (high + low + close) / 3.0
+    flow = np.zeros(n)
+    for i in range(n):
+        raw_flow = typical[i] * volume[i]
+        if np.isnan(raw_flow):
+            flow[i] = np.nan
+        elif i > 0 and typical[i] > typical[i - 1]:
+            flow[i] = raw_flow
+        elif i > 0 and typical[i] < typical[i - 1]:
+            flow[i] = -raw_flow
+
+    out = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        positive = 0.0
+        negative = 0.0
+        complete = True
+        for j in range(i - period + 1, i + 1):
+            if np.isnan(flow[j]):
+                complete = False
+                break
+            if flow[j] >= 0.0:
+                positive += flow[j]
+            else:
+                negative -= flow[j]
+        if not complete:
+            continue
+        if negative != 0.0:
+            out[i] = 100.0 - 100.0 / (1.0 + positive / negative)
+        elif positive != 0.0:
+            out[i] = 100.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rolling_max(x: np.ndarray, period: int, min_periods: int) -> np.ndarray:
+    """
+    滑动窗口最大值 (等价于 pandas rolling(period, min_periods).max())
+
+    Args:
+        x: 输入数组，NaN不参与比较
+        period: 窗口长度
+        min_periods: 窗口内至少需要的有效值个数
+
+    Returns:
+        ndarray: 滑动最大值
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    need = max(min_periods, 1)
+    for i in range(n):
+        best = np.nan
+        count = 0
+        for j in range(max(0, i - period + 1), i + 1):
+            if not np.isnan(x[j]):
+                count += 1
+                if np.isnan(best) or x[j] > best:
+                    best = x[j]
+        if count >= need:
+            out[i] = best
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rolling_min(x: np.ndarray, period: int, min_periods: int) -> np.ndarray:
+    """
+    滑动窗口最小值 (等价于 pandas rolling(period, min_periods).min())
+
+    Args:
+        x: 输入数组，NaN不参与比较
+        period: 窗口长度
+        min_periods: 窗口内至少需要的有效值个数
+
+    Returns:
+        ndarray: 滑动最小值
+    """
+    return -rolling_max(-x, period, min_periods)
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean(x: np.ndarray, period: int, min_periods: int) -> np.ndarray:
+    """
+    滑动窗口均值 (等价于 pandas rolling(period, min_periods).mean())
+
+    Args:
+        x: 输入数组，NaN不计入均值
+        period: 窗口长度
+        min_periods: 窗口内至少需要的有效值个数
+
+    Returns:
+        ndarray: 滑动均值
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    need = max(min_periods, 1)
+    total = 0.0
+    count = 0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            total += x[i]
+            count += 1
+        if i >= period and not np.isnan(x[i - period]):
+            total -= x[i - period]
+            count -= 1
+        if count >= need:
+            out[i] = total / count
+    return out
+
+
+@njit(cache=True, nogil=True)
+def stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               period: int = 14, smooth: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    随机指标
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        period: 回看周期
+        smooth: %D平滑周期
+
+    Returns:
+        tuple: (%K, %D)
+    """
+    highest = rolling_max(high, period, period)
+    lowest = rolling_min(low, period, period)
+    n = len(close)
+    k = np.full(n, np.nan)
+    for i in range(n):
+        if highest[i] != lowest[i]:
+            k[i] = 100.0 * (close[i] - lowest[i]) / (highest[i] - lowest[i])
+    return k, sma(k, smooth)
+
+
+@njit(cache=True, nogil=True)
+def williams_r(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    威廉指标 %R
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        period: 回看周期
+
+    Returns:
+        ndarray: %R，取值范围 [-100, 0]
+    """
+    highest = rolling_max(high, period, period)
+    lowest = rolling_min(low, period, period)
+    n = len(close)
+    out = np.full(n, np.nan)
+    for i in range(n):
+        if highest[i] != lowest[i]:
+            out[i] = -100.0 * (highest[i] - close[i]) / (highest[i] - lowest[i])
+    return out
+
+
+@njit(cache=True, nogil=True)
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+        period: int = 20, constant: float = 0.015) -> np.ndarray:
+    """
+    商品通道指数 (典型价格偏离滑动均值的程度，以平均绝对偏差归一)
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        period: 窗口长度
+        constant: 归一化常数
+
+    Returns:
+        ndarray: CCI
+    """
+    typical = (high + low + close) / 3.0
+    mean = sma(typical, period)
+    n = len(close)
+    out = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        if np.isnan(mean[i]):
+            continue
+        deviation = 0.0
+        for j in range(i - period + 1, i + 1):
+            deviation += abs(typical[j] - mean[i])
+        deviation /= period
+        if deviation != 0.0:
+            out[i] = (typical[i] - mean[i]) / (constant * deviation)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ultimate_oscillator(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                        short: int = 7, medium: int = 14, long: int = 28) -> np.ndarray:
+    """
+    终极振荡器 (三个周期的买压/真实波幅比按 4:2:1 加权)
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        short: 短周期
+        medium: 中周期
+        long: 长周期
+
+    Returns:
+        ndarray: 终极振荡器，取值范围 [0, 100]
+    """
+    n = len(close)
+    pressure = np.full(n, np.nan)
+    for i in range(1, n):
+        pressure[i] = close[i] - np.minimum(low[i], close[i - 1])
+    tr = true_range(high, low, close)
+
+    out = np.zeros(n)
+    for window, weight in ((short, 4.0), (medium, 2.0), (long, 1.0)):
+        pressure_sum = sma(pressure, window)
+        tr_sum = sma(tr, window)
+        for i in range(n):
+            if tr_sum[i] != 0.0:
+                out[i] += weight * pressure_sum[i] / tr_sum[i]
+            else:
+                out[i] = np.nan
+    return 100.0 * out / 7.0
+
+
+@njit(cache=True, nogil=True)
+def psar_up(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+            step: float = 0.02, max_step: float = 0.2) -> np.ndarray:
+    """
+    抛物线SAR的上升趋势部分
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        step: 加速因子步长
+        max_step: 加速因子上限
+
+    Returns:
+        ndarray: 上升趋势中的SAR值，下降趋势处为NaN
+    """
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    up_trend = True
+    factor = step
+    up_trend_high = high[0]
+    down_trend_low = low[0]
+    sar = close.copy()
+
+    for i in range(2, n):
+        reversal = False
+        if up_trend:
+            sar[i] = sar[i - 1] + factor * (up_trend_high - sar[i - 1])
+            if low[i] < sar[i]:
+                reversal = True
+                sar[i] = up_trend_high
+                down_trend_low = low[i]
+                factor = step
+            else:
+                if high[i] > up_trend_high:
+                    up_trend_high = high[i]
+                    factor = min(factor + step, max_step)
+                if low[i - 2] < sar[i]:
+                    sar[i] = low[i - 2]
+                elif low[i - 1] < sar[i]:
+                    sar[i] = low[i - 1]
+        else:
+            sar[i] = sar[i - 1] - factor * (sar[i - 1] - down_trend_low)
+            if high[i] > sar[i]:
+                reversal = True
+                sar[i] = down_trend_low
+                up_trend_high = high[i]
+                factor = step
+            else:
+                if low[i] < down_trend_low:
+                    down_trend_low = low[i]
+                    factor = min(factor + step, max_step)
+                if high[i - 2] > sar[i]:
+                    sar[i] = high[i - 2]
+                elif high[i - 1] > sar[i]:
+                    sar[i] = high[i - 1]
+
+        up_trend = up_trend != reversal
+        if up_trend:
+            out[i] = sar[i]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def cumsum_skipna(x: np.ndarray) -> np.ndarray:
+    """累加和，NaN位置输出NaN但不中断累加 (等价于 pandas Series.cumsum())"""
+    n = len(x)
+    out = np.full(n, np.nan)
+    total = 0.0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            total += x[i]
+            out[i] = total
+    return out
+
+
+@njit(cache=True, nogil=True)
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    能量潮
+
+    Args:
+        close: 收盘价数组
+        volume: 成交量数组
+
+    Returns:
+        ndarray: OBV
+    """
+    signed = volume.copy()
+    for i in range(1, len(close)):
+        if close[i] < close[i - 1]:
+            signed[i] = -volume[i]
+    return cumsum_skipna(signed)
+
+
+@njit(cache=True, nogil=True)
+def acc_dist(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    累积/派发线
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        volume: 成交量数组
+
+    Returns:
+        ndarray: A/D
+    """
+    n = len(close)
+    flow = np.empty(n)
+    for i in range(n):
+        span = high[i] - low[i]
+        clv = ((close[i] - low[i]) - (high[i] - close[i])) / span if span != 0.0 else np.nan
+        # 与ta一致: 无法计算的CLV按0处理
+        flow[i] = (0.0 if np.isnan(clv) else clv) * volume[i]
+    return cumsum_skipna(flow)
+
+
+@njit(cache=True, nogil=True)
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+         volume: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    滑动窗口成交量加权平均价
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        volume: 成交量数组
+        period: 窗口长度
+
+    Returns:
+        ndarray: VWAP
+    """
+    typical = (high + low + close) / 3.0
+    return sma(typical * volume, period) / sma(volume, period)
+
+
+@njit(cache=True, nogil=True)
+def ease_of_movement(high: np.ndarray, low: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    简易波动指标
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        volume: 成交量数组
+
+    Returns:
+        ndarray: EMV (放大1e8倍)，首值为NaN
+    """
+    n = len(high)
+    out = np.full(n, np.nan)
+    for i in range(1, n):
+        if volume[i] != 0.0:
+            out[i] = ((high[i] - high[i - 1]) + (low[i] - low[i - 1])) * (high[i] - low[i]) \
+                / (2.0 * volume[i]) * 100000000.0
+    return out
+
+# 单次遍历内核输出的指标及其行号
+FUSED_COLUMNS = (
+    'SMA_5', 'SMA_10', 'SMA_20', 'SMA_50', 'SMA_100', 'SMA_200',
+    'EMA_12', 'EMA_26', 'EMA_50',
+    'MACD', 'MACD_signal', 'MACD_histogram',
+    'BB_upper', 'BB_middle', 'BB_lower', 'BB_percent', 'BB_width',
+    'RSI_14', 'RSI_21', 'ATR', 'MFI',
+)
+FUSED_SMA_PERIODS = np.array([5, 10, 20, 50, 100, 200])
+_N_FUSED = len(FUSED_COLUMNS)
+
+
+@njit(cache=True, nogil=True)
+def _ewm_step(k: int, cur: float, alpha: float, min_periods: int, weighted: np.ndarray,
+              old_wt: np.ndarray, nobs: np.ndarray) -> float:
+    """推进第k路指数加权平均一步，返回当前输出 (与ewm()逐元素一致)"""
+    is_obs = not np.isnan(cur)
+    if is_obs:
+        nobs[k] += 1
+    if not np.isnan(weighted[k]):
+        old_wt[k] *= 1.0 - alpha
+        if is_obs:
+            if weighted[k] != cur:
+                weighted[k] = (old_wt[k] * weighted[k] + alpha * cur) / (old_wt[k] + alpha)
+            old_wt[k] = 1.0
+    elif is_obs:
+        weighted[k] = cur
+    return weighted[k] if nobs[k] >= min_periods else np.nan
+
+
+@njit(cache=True, nogil=True)
+def _rsi_value(ema_up: float, ema_down: float) -> float:
+    """由平滑后的涨跌幅计算RSI"""
+    if ema_down == 0:
+        return 100.0
+    if np.isnan(ema_down):
+        return np.nan
+    return 100.0 - 100.0 / (1.0 + ema_up / ema_down)
+
+
+@njit(cache=True, nogil=True)
+def fused_indicators(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     volume: np.ndarray) -> np.ndarray:
+    """
+    单次遍历同时计算SMA/EMA/MACD/布林带/RSI/ATR/MFI
+
+    每根K线只读取一次，所有滑动统计量在同一循环中更新，
+    避免对同一数组重复扫描约30次。结果与各独立内核逐元素一致。
+
+    Args:
+        high: 最高价数组
+        low: 最低价数组
+        close: 收盘价数组
+        volume: 成交量数组
+
+    Returns:
+        ndarray: 形状为 (len(FUSED_COLUMNS), n) 的指标矩阵，行顺序同FUSED_COLUMNS
+    """
+    n = len(close)
+    out = np.full((_N_FUSED, n), np.nan)
+    n_sma = len(FUSED_SMA_PERIODS)
+
+    # SMA: 各窗口的累加和与缺失值计数
+    sma_total = np.zeros(n_sma)
+    sma_nan = np.zeros(n_sma, dtype=np.int64)
+
+    # 指数加权平均状态: EMA12, EMA26, EMA50, MACD信号线, RSI14涨/跌, RSI21涨/跌
+    alphas = np.array([2.0 / 13.0, 2.0 / 27.0, 2.0 / 51.0, 2.0 / 10.0,
+                       1.0 / 14.0, 1.0 / 14.0, 1.0 / 21.0, 1.0 / 21.0])
+    min_periods = np.array([12, 26, 50, 9, 14, 14, 21, 21])
+    weighted = np.full(8, np.nan)
+    old_wt = np.ones(8)
+    nobs = np.zeros(8, dtype=np.int64)
+
+    # 布林带: Welford滑动均值/方差
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    bb_count = 0
+
+    # ATR: 前14根真实波幅的均值作为初值
+    atr_sum = 0.0
+    atr_count = 0
+    atr_prev = 0.0
+
+    # MFI: 最近14根资金流的环形缓冲
+    flows = np.zeros(14)
+    prev_typical = np.nan
+
+    for i in range(n):
+        c = close[i]
+        c_nan = np.isnan(c)
+
+        # 简单移动平均线
+        for k in range(n_sma):
+            period = FUSED_SMA_PERIODS[k]
+            if c_nan:
+                sma_nan[k] += 1
+            else:
+                sma_total[k] += c
+            if i >= period:
+                old = close[i - period]
+                if np.isnan(old):
+                    sma_nan[k] -= 1
+                else:
+                    sma_total[k] -= old
+            if i >= period - 1 and sma_nan[k] == 0:
+                out[k, i] = sma_total[k] / period
+
+        # 指数移动平均线与MACD
+        ema12 = _ewm_step(0, c, alphas[0], min_periods[0], weighted, old_wt, nobs)
+        ema26 = _ewm_step(1, c, alphas[1], min_periods[1], weighted, old_wt, nobs)
+        out[6, i] = ema12
+        out[7, i] = ema26
+        out[8, i] = _ewm_step(2, c, alphas[2], min_periods[2], weighted, old_wt, nobs)
+        macd_value = ema12 - ema26
+        signal_value = _ewm_step(3, macd_value, alphas[3], min_periods[3], weighted, old_wt, nobs)
+        out[9, i] = macd_value
+        out[10, i] = signal_value
+        out[11, i] = macd_value - signal_value
+
+        # 布林带
+        if not c_nan:
+            bb_count += 1
+            delta = c - bb_mean
+            bb_mean += delta / bb_count
+            bb_m2 += delta * (c - bb_mean)
+        if i >= 20:
+            old = close[i - 20]
+            if not np.isnan(old):
+                bb_count -= 1
+                if bb_count > 0:
+                    delta = old - bb_mean
+                    bb_mean -= delta / bb_count
+                    bb_m2 -= delta * (old - bb_mean)
+                else:
+                    bb_mean = 0.0
+                    bb_m2 = 0.0
+        if i >= 19 and bb_count == 20:
+            std = np.sqrt(max(bb_m2, 0.0) / bb_count)
+            upper = bb_mean + 2.0 * std
+            lower = bb_mean - 2.0 * std
+            out[12, i] = upper
+            out[13, i] = bb_mean
+            out[14, i] = lower
+            if upper != lower:
+                out[15, i] = (c - lower) / (upper - lower)
+            out[16, i] = (upper - lower) / bb_mean * 100.0
+
+        # RSI
+        up = 0.0
+        down = 0.0
+        if i > 0:
+            diff = c - close[i - 1]
+            if diff > 0:
+                up = diff
+            elif diff < 0:
+                down = -diff
+        out[17, i] = _rsi_value(_ewm_step(4, up, alphas[4], min_periods[4], weighted, old_wt, nobs),
+                                _ewm_step(5, down, alphas[5], min_periods[5], weighted, old_wt, nobs))
+        out[18, i] = _rsi_value(_ewm_step(6, up, alphas[6], min_periods[6], weighted, old_wt, nobs),
+                                _ewm_step(7, down, alphas[7], min_periods[7], weighted, old_wt, nobs))
+
+        # ATR
+        tr = high[i] - low[i]
+        if i > 0 and not np.isnan(close[i - 1]):
+            for gap in (abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])):
+                if np.isnan(tr) or gap > tr:
+                    tr = gap
+        if n >= 14:
+            if i < 14:
+                if not np.isnan(tr):
+                    atr_sum += tr
+                    atr_count += 1
+                if i == 13:
+                    atr_prev = atr_sum / atr_count if atr_count > 0 else np.nan
+                    out[19, i] = atr_prev
+                else:
+                    out[19, i] = 0.0
+            else:
+                atr_prev = (atr_prev * 13 + tr) / 14
+                out[19, i] = atr_prev
+        else:
+            out[19, i] = 0.0
+
+        # MFI
+        typical = (high[i] + low[i] + c) / 3.0
+        raw_flow = typical * volume[i]
+        flow = 0.0
+        if np.isnan(raw_flow):
+            flow = np.nan
+        elif typical > prev_typical:
+            flow = raw_flow
+        elif typical < prev_typical:
+            flow = -raw_flow
+        flows[i % 14] = flow
+        prev_typical = typical
+        if i >= 13:
+            positive = 0.0
+            negative = 0.0
+            complete = True
+            for j in range(14):
+                if np.isnan(flows[j]):
+                    complete = False
+                    break
+                if flows[j] >= 0.0:
+                    positive += flows[j]
+                else:
+                    negative -= flows[j]
+            if complete:
+                if negative != 0.0:
+                    out[20, i] = 100.0 - 100.0 / (1.0 + positive / negative)
+                elif positive != 0.0:
+                    out[20, i] = 100.0
+
+    return out
+
+
+def warmup(length: int = 256) -> None:
+    """
+    预编译所有内核，避免首次分析时承担JIT编译延迟
+
+    Args:
+        length: 虚拟数据长度 (Numba按参数类型而非长度特化，任意长度均可)
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    dummy = np.linspace(1.0, 2.0, length)
+    sma(dummy, 5)
+    ema(dummy, 12)
+    rsi(dummy, 14)
+    macd(dummy, 12, 26, 9)
+    bollinger(dummy, 20, 2.0)
+    atr(dummy + 0.1, dummy - 0.1, dummy, 14)
+    mfi(dummy + 0.1, dummy - 0.1, dummy, dummy, 14)
+    high, low = dummy + 0.1, dummy - 0.1
+    stochastic(high, low, dummy, 14, 3)
+    williams_r(high, low, dummy, 14)
+    cci(high, low, dummy, 20, 0.015)
+    ultimate_oscillator(high, low, dummy, 7, 14, 28)
+    psar_up(high, low, dummy, 0.02, 0.2)
+    rolling_mean(dummy, 20, 0)
+    obv(dummy, dummy)
+    acc_dist(high, low, dummy, dummy)
+    vwap(high, low, dummy, dummy, 14)
+    ease_of_movement(high, low, dummy)
+    fused_indicators(dummy + 0.1, dummy - 0.1, dummy, dummy)
@@ -5,25 +5,235 @@
 
 import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, List, Tuple, Optional
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+import indicators_numba as nb
+
+
+# 指标记忆化缓存容量 (每类指标占一项，一组数据最多四项)
+INDICATOR_MEMO_SIZE = 64
+
+# 各指标计算最新值所需的历史K线数 (含当前K线)，导入时构建一次
+# 固定窗口指标为精确值：在最后 N 根K线上计算的最新值与完整计算相同；
+# EMA/MACD/RSI/ATR 为递归平滑，表中为预热收敛所需长度，其最新值仍依赖全部历史
+_WINDOW_LOOKBACK = {
+    **{f'SMA_{p}': p for p in (5, 10, 20, 50, 100, 200)},
+    'BB_upper': 20, 'BB_middle': 20, 'BB_lower': 20, 'BB_percent': 20, 'BB_width': 20,
+    'Ichimoku_a': 26, 'Ichimoku_b': 52,
+    'Stoch_K': 14, 'Stoch_D': 16, 'Williams_R': 14, 'CCI': 20, 'Momentum': 11,
+    'Ultimate_Oscillator': 29,
+    'Donchian_high': 20, 'Donchian_low': 20, 'Donchian_middle': 10,
+    'Keltner_high': 20, 'Keltner_low': 20, 'Keltner_middle': 20,
+    'MFI': 15, 'VWAP': 14, 'EMV': 2, 'Volume_SMA': 20,
+}
+_LOOKBACK = {
+    **_WINDOW_LOOKBACK,
+    **{f'EMA_{p}': 3 * p for p in (12, 26, 50)},
+    'MACD': 34, 'MACD_signal': 43, 'MACD_histogram': 43,
+    'RSI_14': 30, 'RSI_21': 44, 'ATR': 30,
+}
+
+# 固定窗口指标的最长窗口 (SMA_200)：增量更新时尾部切片需覆盖的历史K线数
+MAX_WINDOW_LOOKBACK = max(_WINDOW_LOOKBACK.values())
+_MAX_LOOKBACK = max(_LOOKBACK.values())
+
+# 增量更新的最少已有K线数：数据较短时尾部切片几乎覆盖全部数据，完整重算反而更快
+INCREMENTAL_MIN_BARS = 2000
+
+# 并行计算四类指标时使用的线程数
+INDICATOR_THREADS = 4
+
+# 共享线程池 (首次并行计算时创建)，避免每次分析都创建和销毁线程
+_indicator_pool: Optional[ThreadPoolExecutor] = None
+_indicator_pool_lock = threading.Lock()
+
+
+def get_lookback(name: str) -> int:
+    """
+    查询指标计算最新值所需的历史K线数
+    
+    Args:
+        name: 指标名 (如 SMA_20)
+        
+    Returns:
+        int: 所需K线数，未知指标返回表中最大值
+    """
+    return _LOOKBACK.get(name, _MAX_LOOKBACK)
+
+
+def _get_indicator_pool() -> ThreadPoolExecutor:
+    """获取并行计算指标用的共享线程池"""
+    global _indicator_pool
+    with _indicator_pool_lock:
+        if _indicator_pool is None:
+            _indicator_pool = ThreadPoolExecutor(max_workers=INDICATOR_THREADS,
+                                                 thread_name_prefix='indicators')
+        return _indicator_pool
+
+
+def memoize_indicators(method: Callable) -> Callable:
+    """
+    按OHLCV数据指纹缓存某一类指标的计算结果
+
+    相同数据 (包括索引) 再次分析时直接复用已计算的指标，不再重新计算；
+    缓存为进程内LRU，按类别存放只读数组，容量由 INDICATOR_MEMO_SIZE 限定。
+    每个分析器拿到各自的Series包装，共享的数组不可原地修改
+
+    Args:
+        method: 返回指标字典的 calculate_*_indicators 方法
+
+    Returns:
+        Callable: 带缓存的方法
+    """
+    @functools.wraps(method)
+    def wrapper(self) -> Dict[str, pd.Series]:
+        if self._scratch:
+            return method(self)
+        
+        key = (self._data_key, method.__name__)
+        memo = TechnicalAnalyzer._memo
+        with TechnicalAnalyzer._memo_lock:
+            arrays = memo.get(key)
+            if arrays is not None:
+                memo.move_to_end(key)
+        
+        if arrays is None:
+            indicators = method(self)
+            with TechnicalAnalyzer._memo_lock:
+                memo[key] = {name: series.to_numpy() for name, series in indicators.items()}
+                while len(memo) > INDICATOR_MEMO_SIZE:
+                    memo.popitem(last=False)
+        else:
+            indicators = {name: self._series(values) for name, values in arrays.items()}
+            self.indicators.update(indicators)
+        return indicators
+    
+    return wrapper
+
 
 class TechnicalAnalyzer:
     """技术分析器"""
     
+    # (数据指纹, 指标类别) -> 指标名到只读数组的字典，所有实例共享
+    _memo: "OrderedDict[Tuple[str, str], Dict[str, np.ndarray]]" = OrderedDict()
+    _memo_lock = threading.Lock()
+    
     def __init__(self, data: pd.DataFrame):
         """
         初始化技术分析器
         
+        不复制输入数据，OHLCV数组尽量直接引用其内存；分析期间调用方不应原地修改 data
+        (追加数据请使用 update)
+        
         Args:
-            data: 包含OHLCV数据的DataFrame
+            data: 包含OHLCV数据的DataFrame (只读)
         """
-        self.data = data.copy()
         self.indicators = {}
+        # 临时分析器 (增量更新用的尾部切片)：结果保持为数组，也不写入共享的指标缓存
+        self._scratch = False
+        self._load(data)
+    
+    @classmethod
+    def _scratch_analyzer(cls, data: pd.DataFrame) -> 'TechnicalAnalyzer':
+        """
+        创建临时分析器：不计算数据指纹、不使用指标缓存，指标保持为数组
+        
+        Args:
+            data: 包含OHLCV数据的DataFrame (只读)
+            
+        Returns:
+            TechnicalAnalyzer: 临时分析器
+        """
+        analyzer = cls.__new__(cls)
+        analyzer.indicators = {}
+        analyzer._scratch = True
+        analyzer._load(data)
+        return analyzer
+    
+    def _load(self, data: pd.DataFrame) -> None:
+        """
+        载入数据：转换OHLCV数组并计算数据指纹，清空依赖旧数据的中间结果
+        
+        Args:
+            data: 包含OHLCV数据的DataFrame (只读，不复制)
+        """
+        self.data = data
+        self._fused = None
+        self._latest = None
+        
+        # OHLCV一次性转为连续的float64数组，指标内核直接在数组上计算
+        # (列本身已是连续float64时为零拷贝视图)
+        self._o, self._h, self._l, self._c, self._v = [
+            np.ascontiguousarray(self.data[col].to_numpy(dtype=np.float64))
+            for col in ('Open', 'High', 'Low', 'Close', 'Volume')
+        ]
+        # 内核输出的数组在存入指标字典时才按此索引包装成Series
+        self._index = self.data.index
+        
+        # 数据指纹：OHLCV与时间索引完全相同时才复用缓存的指标 (临时分析器不使用缓存)
+        if self._scratch:
+            self._data_key = None
+            return
+        digest = hashlib.blake2b(digest_size=16)
+        for values in (self._o, self._h, self._l, self._c, self._v):
+            digest.update(values.tobytes())
+        digest.update(pd.util.hash_pandas_object(self._index, index=False).to_numpy().tobytes())
+        digest.update(str(self._index.dtype).encode())
+        self._data_key = digest.hexdigest()
+    
+    @staticmethod
+    def warmup(length: int = 256) -> None:
+        """
+        预热指标内核：用虚拟数据调用一遍所有JIT内核，使首次真实分析无需等待编译
+        
+        Args:
+            length: 虚拟数据长度
+        """
+        nb.warmup(length)
+    
+    @staticmethod
+    def start_warmup() -> threading.Thread:
+        """
+        在后台守护线程中预热指标内核，不阻塞程序启动
+        
+        Returns:
+            threading.Thread: 预热线程
+        """
+        thread = threading.Thread(target=TechnicalAnalyzer.warmup, name='indicator-warmup', daemon=True)
+        thread.start()
+        return thread
+    
+    def _series(self, values: np.ndarray) -> pd.Series:
+        """
+        将内核输出的数组包装回与原始数据对齐的Series (不复制)
+        
+        数组可能同时存放在共享的指标缓存中，因此设为只读
+        """
+        if self._scratch:
+            return values
+        values.flags.writeable = False
+        return pd.Series(values, index=self._index, copy=False)
+    
+    def _fused_indicators(self) -> Dict[str, pd.Series]:
+        """
+        单次遍历计算全部Numba内核指标，结果在各类别计算之间共享
+        
+        Returns:
+            Dict: SMA/EMA/MACD/布林带/RSI/ATR/MFI 指标字典
+        """
+        if self._fused is None:
+            matrix = nb.fused_indicators(self._h, self._l, self._c, self._v)
+            self._fused = {name: self._series(matrix[k]) for k, name in enumerate(nb.FUSED_COLUMNS)}
+        return self._fused
         
+    @memoize_indicators
     def calculate_trend_indicators(self) -> Dict[str, pd.Series]:
         """
         计算趋势指标
@@ -32,38 +242,39 @@ class TechnicalAnalyzer:
             Dict: 趋势指标字典
         """
         indicators = {}
+        fused = self._fused_indicators()
         
         # 简单移动平均线
         for period in [5, 10, 20, 50, 100, 200]:
-            indicators[f'SMA_{period}'] = ta.trend.sma_indicator(self.data['Close'], window=period)
+            indicators[f'SMA_{period}'] = fused[f'SMA_{period}']
         
         # 指数移动平均线
         for period in [12, 26, 50]:
-            indicators[f'EMA_{period}'] = ta.trend.ema_indicator(self.data['Close'], window=period)
+            indicators[f'EMA_{period}'] = fused[f'EMA_{period}']
         
         # MACD
-        indicators['MACD'] = ta.trend.macd(self.data['Close'])
-        indicators['MACD_signal'] = ta.trend.macd_signal(self.data['Close'])
-        indicators['MACD_histogram'] = ta.trend.macd_diff(self.data['Close'])
+        for name in ['MACD', 'MACD_signal', 'MACD_histogram']:
+            indicators[name] = fused[name]
         
         # 布林带
-        bb = ta.volatility.BollingerBands(self.data['Close'])
-        indicators['BB_upper'] = bb.bollinger_hband()
-        indicators['BB_middle'] = bb.bollinger_mavg()
-        indicators['BB_lower'] = bb.bollinger_lband()
-        indicators['BB_percent'] = bb.bollinger_pband()
-        indicators['BB_width'] = bb.bollinger_wband()
+        for name in ['BB_upper', 'BB_middle', 'BB_lower', 'BB_percent', 'BB_width']:
+            indicators[name] = fused[name]
         
         # 抛物线SAR
-        indicators['PSAR'] = ta.trend.psar_up(self.data['High'], self.data['Low'], self.data['Close'])
-        
-        # 一目均衡表
-        indicators['Ichimoku_a'] = ta.trend.ichimoku_a(self.data['High'], self.data['Low'])
-        indicators['Ichimoku_b'] = ta.trend.ichimoku_b(self.data['High'], self.data['Low'])
+        indicators['PSAR'] = self._series(nb.psar_up(self._h, self._l, self._c))
+        
+        # 一目均衡表 (先行带B与ta一致，窗口未满时使用已有数据)
+        conversion = 0.5 * (nb.rolling_max(self._h, 9, 9) + nb.rolling_min(self._l, 9, 9))
+        base = 0.5 * (nb.rolling_max(self._h, 26, 26) + nb.rolling_min(self._l, 26, 26))
+        indicators['Ichimoku_a'] = self._series(0.5 * (conversion + base))
+        indicators['Ichimoku_b'] = self._series(
+            0.5 * (nb.rolling_max(self._h, 52, 0) + nb.rolling_min(self._l, 52, 0))
+        )
         
         self.indicators.update(indicators)
         return indicators
     
+    @memoize_indicators
     def calculate_momentum_indicators(self) -> Dict[str, pd.Series]:
         """
         计算动量指标
@@ -72,32 +283,35 @@ class TechnicalAnalyzer:
             Dict: 动量指标字典
         """
         indicators = {}
+        fused = self._fused_indicators()
         
         # RSI
         for period in [14, 21]:
-            indicators[f'RSI_{period}'] = ta.momentum.rsi(self.data['Close'], window=period)
+            indicators[f'RSI_{period}'] = fused[f'RSI_{period}']
         
         # 随机指标
-        indicators['Stoch_K'] = ta.momentum.stoch(self.data['High'], self.data['Low'], self.data['Close'])
-        indicators['Stoch_D'] = ta.momentum.stoch_signal(self.data['High'], self.data['Low'], self.data['Close'])
+        stoch_k, stoch_d = nb.stochastic(self._h, self._l, self._c)
+        indicators['Stoch_K'] = self._series(stoch_k)
+        indicators['Stoch_D'] = self._series(stoch_d)
         
         # Williams %R
-        indicators['Williams_R'] = ta.momentum.williams_r(self.data['High'], self.data['Low'], self.data['Close'])
+        indicators['Williams_R'] = self._series(nb.williams_r(self._h, self._l, self._c))
         
         # 商品通道指数CCI
-        indicators['CCI'] = ta.trend.cci(self.data['High'], self.data['Low'], self.data['Close'])
+        indicators['CCI'] = self._series(nb.cci(self._h, self._l, self._c))
         
         # 动量指标
-        indicators['Momentum'] = ta.momentum.roc(self.data['Close'], window=10)
+        momentum = np.full(len(self._c), np.nan)
+        momentum[10:] = (self._c[10:] - self._c[:-10]) / self._c[:-10] * 100
+        indicators['Momentum'] = self._series(momentum)
         
         # 终极振荡器
-        indicators['Ultimate_Oscillator'] = ta.momentum.ultimate_oscillator(
-            self.data['High'], self.data['Low'], self.data['Close']
-        )
+        indicators['Ultimate_Oscillator'] = self._series(nb.ultimate_oscillator(self._h, self._l, self._c))
         
         self.indicators.update(indicators)
         return indicators
     
+    @memoize_indicators
     def calculate_volatility_indicators(self) -> Dict[str, pd.Series]:
         """
         计算波动性指标
@@ -108,35 +322,26 @@ class TechnicalAnalyzer:
         indicators = {}
         
         # 平均真实范围ATR
-        indicators['ATR'] = ta.volatility.average_true_range(
-            self.data['High'], self.data['Low'], self.data['Close']
-        )
+        indicators['ATR'] = self._fused_indicators()['ATR']
         
         # 唐奇安通道
-        indicators['Donchian_high'] = ta.volatility.donchian_channel_hband(
-            self.data['High'], self.data['Low'], self.data['Close']
-        )
-        indicators['Donchian_low'] = ta.volatility.donchian_channel_lband(
-            self.data['High'], self.data['Low'], self.data['Close']
-        )
-        indicators['Donchian_middle'] = ta.volatility.donchian_channel_mband(
-            self.data['High'], self.data['Low'], self.data['Close']
-        )
-        
-        # 肯特纳通道
-        indicators['Keltner_high'] = ta.volatility.keltner_channel_hband(
-            self.data['High'], self.data['Low'], self.data['Close']
-        )
-        indicators['Keltner_low'] = ta.volatility.keltner_channel_lband(
-            self.data['High'], self.data['Low'], self.data['Close']
-        )
-        indicators['Keltner_middle'] = ta.volatility.keltner_channel_mband(
-            self.data['High'], self.data['Low'], self.data['Close']
-        )
+        indicators['Donchian_high'] = self._series(nb.rolling_max(self._h, 20, 20))
+        indicators['Donchian_low'] = self._series(nb.rolling_min(self._l, 20, 20))
+        # 中轨沿用ta的默认窗口 (10)
+        middle_high = nb.rolling_max(self._h, 10, 10)
+        middle_low = nb.rolling_min(self._l, 10, 10)
+        indicators['Donchian_middle'] = self._series((middle_high - middle_low) / 2.0 + middle_low)
+        
+        # 肯特纳通道 (原始版本：上下轨与ta一致，窗口未满时使用已有数据)
+        high, low, close = self._h, self._l, self._c
+        indicators['Keltner_high'] = self._series(nb.rolling_mean((4 * high - 2 * low + close) / 3.0, 20, 0))
+        indicators['Keltner_low'] = self._series(nb.rolling_mean((-2 * high + 4 * low + close) / 3.0, 20, 0))
+        indicators['Keltner_middle'] = self._series(nb.sma((high + low + close) / 3.0, 20))
         
         self.indicators.update(indicators)
         return indicators
     
+    @memoize_indicators
     def calculate_volume_indicators(self) -> Dict[str, pd.Series]:
         """
         计算成交量指标
@@ -147,56 +352,189 @@ class TechnicalAnalyzer:
         indicators = {}
         
         # 能量潮OBV
-        indicators['OBV'] = ta.volume.on_balance_volume(self.data['Close'], self.data['Volume'])
+        indicators['OBV'] = self._series(nb.obv(self._c, self._v))
         
         # 累积/派发线A/D
-        indicators['AD'] = ta.volume.acc_dist_index(
-            self.data['High'], self.data['Low'], self.data['Close'], self.data['Volume']
-        )
+        indicators['AD'] = self._series(nb.acc_dist(self._h, self._l, self._c, self._v))
         
         # 资金流量指数MFI
-        indicators['MFI'] = ta.volume.money_flow_index(
-            self.data['High'], self.data['Low'], self.data['Close'], self.data['Volume']
-        )
+        indicators['MFI'] = self._fused_indicators()['MFI']
         
         # 成交量加权平均价格VWAP
-        indicators['VWAP'] = ta.volume.volume_weighted_average_price(
-            self.data['High'], self.data['Low'], self.data['Close'], self.data['Volume']
-        )
+        indicators['VWAP'] = self._series(nb.vwap(self._h, self._l, self._c, self._v))
         
         # 简易波动指标EMV
-        indicators['EMV'] = ta.volume.ease_of_movement(
-            self.data['High'], self.data['Low'], self.data['Volume']
-        )
+        indicators['EMV'] = self._series(nb.ease_of_movement(self._h, self._l, self._v))
         
         # 成交量震荡器
-        indicators['Volume_SMA'] = ta.trend.sma_indicator(self.data['Volume'], window=20)
+        indicators['Volume_SMA'] = self._series(nb.sma(self._v, 20))
         
         self.indicators.update(indicators)
         return indicators
     
-    def calculate_all_indicators(self) -> Dict[str, pd.Series]:
+    def _category_methods(self) -> Tuple[Callable, ...]:
+        """四类指标的计算方法 (趋势/动量/波动性/成交量)"""
+        return (self.calculate_trend_indicators, self.calculate_momentum_indicators,
+                self.calculate_volatility_indicators, self.calculate_volume_indicators)
+    
+    def _path_dependent_indicators(self) -> Dict[str, np.ndarray]:
         """
-        计算所有技术指标
+        计算最新值依赖全部历史的指标 (递归平滑与累加类)，每个内核对完整数组单次遍历
         
         Returns:
-            Dict: 所有指标字典
+            Dict: 指标名 -> 完整长度的指标数组
+        """
+        h, l, c, v = self._h, self._l, self._c, self._v
+        macd_line, signal_line, histogram = nb.macd(c, 12, 26, 9)
+        return {
+            'EMA_12': nb.ema(c, 12),
+            'EMA_26': nb.ema(c, 26),
+            'EMA_50': nb.ema(c, 50),
+            'MACD': macd_line,
+            'MACD_signal': signal_line,
+            'MACD_histogram': histogram,
+            'RSI_14': nb.rsi(c, 14),
+            'RSI_21': nb.rsi(c, 21),
+            'ATR': nb.atr(h, l, c, 14),
+            'PSAR': nb.psar_up(h, l, c),
+            'OBV': nb.obv(c, v),
+            'AD': nb.acc_dist(h, l, c, v),
+        }
+    
+    def update(self, new_bars: pd.DataFrame) -> Dict[str, pd.Series]:
         """
-        print("🔄 计算趋势指标...")
-        self.calculate_trend_indicators()
+        追加新K线 (可包含对最后一根未收盘K线的修正) 并增量刷新已计算的指标
+        
+        固定窗口指标只在覆盖 MAX_WINDOW_LOOKBACK 根历史K线的尾部切片上重算，
+        新值拼接在原有结果之后；EMA/MACD/RSI/ATR/PSAR/OBV/AD 的最新值依赖全部历史，
+        改用Numba内核在完整数组上重算
+        
+        Args:
+            new_bars: 新的OHLCV数据，已有数据中时间戳不早于其首行的K线会被替换
+            
+        Returns:
+            Dict: 更新后的指标字典 (此前未计算过指标时为空，之后按需计算)
+        """
+        if new_bars.empty:
+            return self.indicators
+        
+        kept = self.data[self.data.index < new_bars.index[0]]
+        self._load(pd.concat([kept, new_bars]))
+        
+        previous = self.indicators
+        if not previous:
+            return self.indicators
+        start = len(kept)
+        fresh = len(self._c) - start
+        
+        if start < INCREMENTAL_MIN_BARS:
+            self.indicators = {}
+            for calculate in self._category_methods():
+                calculate()
+            return self.indicators
+        
+        # 固定窗口指标：在尾部切片上重算
+        tail = TechnicalAnalyzer._scratch_analyzer(self.data.iloc[start - MAX_WINDOW_LOOKBACK:])
+        for calculate in tail._category_methods():
+            calculate()
+        
+        # 路径依赖指标：在完整数组上重算
+        path_dependent = self._path_dependent_indicators()
         
-        print("🔄 计算动量指标...")
-        self.calculate_momentum_indicators()
+        self.indicators = {}
+        for name, series in previous.items():
+            if name in path_dependent:
+                values = path_dependent[name]
+            else:
+                values = np.concatenate([series.to_numpy()[:start], np.asarray(tail.indicators[name])[-fresh:]])
+            self.indicators[name] = self._series(values)
+        return self.indicators
+    
+    def calculate_all_indicators(self, parallel: bool = False) -> Dict[str, pd.Series]:
+        """
+        计算所有技术指标
         
-        print("🔄 计算波动性指标...")
-        self.calculate_volatility_indicators()
+        Args:
+            parallel: 是否用线程池并行计算四类指标。指标内核不持有GIL，
+                多核机器上分析长序列时可以并行；批量分析已在进程池中运行，应保持关闭
         
-        print("🔄 计算成交量指标...")
-        self.calculate_volume_indicators()
+        Returns:
+            Dict: 所有指标字典
+        """
+        messages = ["🔄 计算趋势指标...", "🔄 计算动量指标...", "🔄 计算波动性指标...", "🔄 计算成交量指标..."]
+        categories = list(zip(messages, self._category_methods()))
+        
+        if parallel:
+            print("🔄 并行计算趋势/动量/波动性/成交量指标...")
+            # 各类别共享的单次遍历结果先算好，避免多个线程重复计算
+            self._fused_indicators()
+            pool = _get_indicator_pool()
+            futures = [pool.submit(calculate) for _, calculate in categories]
+            results = [future.result() for future in futures]
+            
+            # 线程完成顺序不定，按类别顺序重建指标字典，保证列顺序与串行计算一致
+            self.indicators = {}
+            for indicators in results:
+                self.indicators.update(indicators)
+        else:
+            for message, calculate in categories:
+                print(message)
+                calculate()
         
         print("✅ 所有技术指标计算完成")
         return self.indicators
     
+    def _tail_slice(self, name: str) -> slice:
+        """覆盖指标在最后两根K线上所需历史的切片"""
+        n = len(self._c)
+        return slice(max(n - get_lookback(name) - 1, 0), n)
+    
+    def calculate_latest_only(self) -> Dict[str, np.ndarray]:
+        """
+        仅计算信号与摘要用到的指标在最后两根K线上的值
+        
+        固定窗口指标 (SMA/布林带/Williams %R/CCI/MFI) 只在尾部窗口切片上计算；
+        RSI/MACD/ATR 为递归平滑，最新值依赖全部历史，仍在完整数组上计算
+        
+        Returns:
+            Dict: 指标名 -> 最后两根K线的指标值数组
+        """
+        if self._latest is None:
+            h, l, c, v = self._h, self._l, self._c, self._v
+            values = {}
+            
+            for period in [5, 20, 50]:
+                s = self._tail_slice(f'SMA_{period}')
+                values[f'SMA_{period}'] = nb.sma(c[s], period)
+            
+            s = self._tail_slice('BB_percent')
+            values['BB_percent'] = nb.bollinger(c[s], 20, 2.0)[3]
+            s = self._tail_slice('CCI')
+            values['CCI'] = nb.cci(h[s], l[s], c[s])
+            s = self._tail_slice('Williams_R')
+            values['Williams_R'] = nb.williams_r(h[s], l[s], c[s])
+            # MFI 的资金流方向取决于前一根K线，比窗口多需要一根
+            s = self._tail_slice('MFI')
+            values['MFI'] = nb.mfi(h[s], l[s], c[s], v[s], 14)
+            
+            values['RSI_14'] = nb.rsi(c, 14)
+            values['MACD'], values['MACD_signal'], _ = nb.macd(c, 12, 26, 9)
+            values['ATR'] = nb.atr(h, l, c, 14)
+            
+            self._latest = {name: series[-2:] for name, series in values.items()}
+        return self._latest
+    
+    def _latest_values(self) -> Dict[str, np.ndarray]:
+        """
+        最后两根K线的指标值：已计算完整指标时直接取其尾部，否则走 calculate_latest_only 快速路径
+        
+        Returns:
+            Dict: 指标名 -> 最后两根K线的指标值数组
+        """
+        if self.indicators:
+            return {name: series.to_numpy()[-2:] for name, series in self.indicators.items()}
+        return self.calculate_latest_only()
+    
     def generate_trading_signals(self) -> Dict[str, List[str]]:
         """
         生成交易信号
@@ -204,19 +542,18 @@ class TechnicalAnalyzer:
         Returns:
             Dict: 包含买入、卖出、中性信号的字典
         """
-        if not self.indicators:
-            self.calculate_all_indicators()
+        values = self._latest_values()
         
         signals = {'buy': [], 'sell': [], 'neutral': [], 'score': 0}
         
         # 获取最新数据
         latest_idx = -1
-        prev_idx = -2 if len(self.data) > 1 else -1
+        prev_idx = -2 if len(self._c) > 1 else -1
         
         try:
             # RSI信号
-            rsi = self.indicators['RSI_14'].iloc[latest_idx]
-            if not pd.isna(rsi):
+            rsi = values['RSI_14'][latest_idx]
+            if not np.isnan(rsi):
                 if rsi < 30:
                     signals['buy'].append(f"RSI超卖 ({rsi:.1f})")
                     signals['score'] += 20
@@ -227,12 +564,12 @@ class TechnicalAnalyzer:
                     signals['neutral'].append(f"RSI正常 ({rsi:.1f})")
             
             # MACD信号
-            macd_current = self.indicators['MACD'].iloc[latest_idx]
-            macd_signal_current = self.indicators['MACD_signal'].iloc[latest_idx]
-            macd_prev = self.indicators['MACD'].iloc[prev_idx]
-            macd_signal_prev = self.indicators['MACD_signal'].iloc[prev_idx]
+            macd_current = values['MACD'][latest_idx]
+            macd_signal_current = values['MACD_signal'][latest_idx]
+            macd_prev = values['MACD'][prev_idx]
+            macd_signal_prev = values['MACD_signal'][prev_idx]
             
-            if not any(pd.isna([macd_current, macd_signal_current, macd_prev, macd_signal_prev])):
+            if not np.isnan([macd_current, macd_signal_current, macd_prev, macd_signal_prev]).any():
                 if macd_current > macd_signal_current and macd_prev <= macd_signal_prev:
                     signals['buy'].append("MACD金叉")
                     signals['score'] += 25
@@ -241,8 +578,8 @@ class TechnicalAnalyzer:
                     signals['score'] -= 25
             
             # 布林带信号
-            bb_percent = self.indicators['BB_percent'].iloc[latest_idx]
-            if not pd.isna(bb_percent):
+            bb_percent = values['BB_percent'][latest_idx]
+            if not np.isnan(bb_percent):
                 if bb_percent > 0.8:
                     signals['sell'].append(f"布林带高位 ({bb_percent:.2f})")
                     signals['score'] -= 15
@@ -251,11 +588,11 @@ class TechnicalAnalyzer:
                     signals['score'] += 15
             
             # 移动平均线信号
-            close_price = self.data['Close'].iloc[latest_idx]
-            sma_20 = self.indicators['SMA_20'].iloc[latest_idx]
-            sma_50 = self.indicators['SMA_50'].iloc[latest_idx]
+            close_price = self._c[latest_idx]
+            sma_20 = values['SMA_20'][latest_idx]
+            sma_50 = values['SMA_50'][latest_idx]
             
-            if not any(pd.isna([close_price, sma_20, sma_50])):
+            if not np.isnan([close_price, sma_20, sma_50]).any():
                 above_sma20 = close_price > sma_20
                 above_sma50 = close_price > sma_50
                 
@@ -267,8 +604,8 @@ class TechnicalAnalyzer:
                     signals['score'] -= 15
             
             # Williams %R信号
-            wr = self.indicators['Williams_R'].iloc[latest_idx]
-            if not pd.isna(wr):
+            wr = values['Williams_R'][latest_idx]
+            if not np.isnan(wr):
                 if wr > -20:
                     signals['sell'].append(f"Williams %R超买 ({wr:.1f})")
                     signals['score'] -= 10
@@ -277,8 +614,8 @@ class TechnicalAnalyzer:
                     signals['score'] += 10
             
             # MFI信号
-            mfi = self.indicators['MFI'].iloc[latest_idx]
-            if not pd.isna(mfi):
+            mfi = values['MFI'][latest_idx]
+            if not np.isnan(mfi):
                 if mfi > 80:
                     signals['sell'].append(f"MFI超买 ({mfi:.1f})")
                     signals['score'] -= 10
@@ -298,8 +635,7 @@ class TechnicalAnalyzer:
         Returns:
             Dict: 最新指标值摘要
         """
-        if not self.indicators:
-            self.calculate_all_indicators()
+        values = self._latest_values()
         
         summary = {}
         latest_idx = -1
@@ -311,19 +647,19 @@ class TechnicalAnalyzer:
         ]
         
         for indicator in key_indicators:
-            if indicator in self.indicators:
-                value = self.indicators[indicator].iloc[latest_idx]
-                if not pd.isna(value):
+            if indicator in values:
+                value = values[indicator][latest_idx]
+                if not np.isnan(value):
                     summary[indicator] = round(float(value), 3)
         
         # 价格相对于移动平均线的位置
-        close_price = self.data['Close'].iloc[latest_idx]
+        close_price = self._c[latest_idx]
         for period in [5, 20, 50]:
             sma_key = f'SMA_{period}'
-            if sma_key in self.indicators:
-                sma_value = self.indicators[sma_key].iloc[latest_idx]
-                if not pd.isna(sma_value):
-                    summary[f'Price_vs_{sma_key}'] = round((close_price / sma_value - 1) * 100, 2)
+            if sma_key in values:
+                sma_value = values[sma_key][latest_idx]
+                if not np.isnan(sma_value):
+                    summary[f'Price_vs_{sma_key}'] = round(float(close_price / sma_value - 1) * 100, 2)
         
         return summary
     
@@ -337,29 +673,32 @@ class TechnicalAnalyzer:
         if not self.indicators:
             self.calculate_all_indicators()
         
-        result_data = self.data.copy()
-        
-        for name, series in self.indicators.items():
-            result_data[name] = series
+        # 所有指标先堆叠成一个float64数据块，再与原始数据一次性拼接，避免逐列插入
+        names = list(self.indicators)
+        matrix = np.column_stack([self.indicators[name].to_numpy(dtype=np.float64) for name in names])
+        indicators_df = pd.DataFrame(matrix, index=self._index, columns=names)
         
-        return result_data
+        return pd.concat([self.data, indicators_df], axis=1)
 
 
-def analyze_stock_technical(data: pd.DataFrame, symbol: str = "") -> Dict:
+def analyze_stock_technical(data: pd.DataFrame, symbol: str = "", include_data: bool = True) -> Dict:
     """
     对股票进行完整的技术分析
     
     Args:
         data: 股票OHLCV数据
         symbol: 股票代码
+        include_data: 是否在结果中附带含全部指标的数据 (绘图需要)；
+            为False时只计算信号与摘要所需的最新指标值
         
     Returns:
         Dict: 分析结果
     """
     analyzer = TechnicalAnalyzer(data)
     
-    # 计算所有指标
-    indicators = analyzer.calculate_all_indicators()
+    # 计算所有指标 (仅需信号与摘要时跳过)
+    if include_data:
+        analyzer.calculate_all_indicators()
     
     # 生成交易信号
     signals = analyzer.generate_trading_signals()
@@ -367,24 +706,26 @@ def analyze_stock_technical(data: pd.DataFrame, symbol: str = "") -> Dict:
     # 获取指标摘要
     summary = analyzer.get_indicator_summary()
     
-    # 当前价格信息
-    latest = data.iloc[-1]
-    prev = data.iloc[-2] if len(data) > 1 else latest
+    # 当前价格信息 (直接读取分析器中的收盘价/成交量数组)
+    close = analyzer._c
+    latest_close = close[-1]
+    prev_close = close[-2] if len(close) > 1 else latest_close
     
-    price_change = latest['Close'] - prev['Close']
-    price_change_pct = (price_change / prev['Close']) * 100
+    price_change = latest_close - prev_close
+    price_change_pct = (price_change / prev_close) * 100
     
     result = {
         'symbol': symbol,
         'analysis_date': data.index[-1].strftime('%Y-%m-%d'),
-        'current_price': round(latest['Close'], 2),
+        'current_price': round(latest_close, 2),
         'price_change': round(price_change, 2),
         'price_change_pct': round(price_change_pct, 2),
-        'volume': int(latest['Volume']),
+        'volume': int(analyzer._v[-1]),
         'indicators': summary,
-        'signals': signals,
-        'data_with_indicators': analyzer.add_indicators_to_data()
+        'signals': signals
     }
+    if include_data:
+        result['data_with_indicators'] = analyzer.add_indicators_to_data()
     
     return result
 